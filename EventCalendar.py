@@ -0,0 +1,87 @@
+from IndexedHeap import IndexedHeap
+from sys import maxint
+
+class EventCalendar(object):
+
+    """
+    __init__
+
+    Initialize the departure calendar for the simulator. The calendar holds the absolute time of the next departure
+    for every server that has a job in its queue, so the server with the next departure can be found without scanning
+    the servers. Scheduling and cancelling a departure costs O(log numServers).
+
+    @param numServers: number of servers the calendar tracks
+    @return: none
+    """
+    def __init__(self, numServers):
+        super(EventCalendar, self).__init__()
+        self.departures = IndexedHeap(numServers)
+
+# Getters
+
+    """
+    getServerWithNextDeparture
+
+    @return: index of the server with the earliest departure, ties going to the lowest index. None if no departures
+             are scheduled
+    """
+    def getServerWithNextDeparture(self):
+        return self.departures.peek()
+
+    """
+    getNextDepartureTime
+
+    @return: absolute time of the earliest departure, maxint if no departures are scheduled
+    """
+    def getNextDepartureTime(self):
+        index = self.departures.peek()
+        if index is None:
+            return maxint
+        return self.departures.getKey(index)
+
+    """
+    getDepartureTime
+
+    @param index: index of the server
+    @return: absolute time of the next departure of the server, maxint if the server has nothing scheduled
+    """
+    def getDepartureTime(self, index):
+        departureTime = self.departures.getKey(index)
+        if departureTime is None:
+            return maxint
+        return departureTime
+
+# Functionality methods
+
+    """
+    scheduleDeparture
+
+    Schedule (or reschedule) the next departure of a server.
+
+    @param index: index of the server
+    @param departureTime: absolute time at which the job at the head of the server's queue will finish
+    @return: none
+    """
+    def scheduleDeparture(self, index, departureTime):
+        self.departures.update(index, departureTime)
+
+    """
+    cancelDeparture
+
+    Remove the departure of a server from the calendar, i.e. when its queue is empty.
+
+    @param index: index of the server
+    @return: none
+    """
+    def cancelDeparture(self, index):
+        self.departures.remove(index)
+
+    """
+    clear
+
+    Remove all scheduled departures.
+
+    @return: none
+    """
+    def clear(self):
+        self.departures.clear()
@@ -0,0 +1,88 @@
+import numpy as np
+from scipy.stats import norm
+
+class GaussianProcess(object):
+
+    """
+    __init__
+
+    Initialize a Gaussian process regression model with a squared exponential kernel, used as the surrogate of the
+    penalty function by the surrogate optimizer. Inputs are expected scaled to [0, 1] in every dimension, and the
+    outputs are standardized before fitting.
+
+    @param lengthScale: length scale of the kernel in the scaled inputs
+    @param noise: variance of the observation noise relative to the variance of the outputs
+    @return: none
+    """
+    def __init__(self, lengthScale=0.2, noise=0.01):
+        super(GaussianProcess, self).__init__()
+        self.lengthScale = lengthScale
+        self.noise = noise
+        self.X = None
+        self.alpha = None
+        self.L = None
+        self.yMean = 0.0
+        self.yStd = 1.0
+
+# Getters
+
+    """
+    getExpectedImprovement
+
+    @param X: (n x d) array of points to evaluate
+    @param best: lowest output observed so far
+    @return: array of the expected improvement over best at each point, for minimization
+    """
+    def getExpectedImprovement(self, X, best):
+        mean, std = self.predict(X)
+        improvement = best - mean
+        expected = np.zeros(len(mean))
+        uncertain = std > 0
+        z = improvement[uncertain] / std[uncertain]
+        expected[uncertain] = improvement[uncertain] * norm.cdf(z) + std[uncertain] * norm.pdf(z)
+        return expected
+
+# Functionality methods
+
+    """
+    fit
+
+    Fit the model to observed points.
+
+    @param X: (n x d) array of the points observed
+    @param y: array of the n outputs observed
+    @return: none
+    """
+    def fit(self, X, y):
+        self.X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.yMean = y.mean()
+        self.yStd = y.std() if y.std() > 0 else 1.0
+        K = self.kernel(self.X, self.X) + self.noise * np.eye(len(self.X))
+        self.L = np.linalg.cholesky(K)
+        self.alpha = np.linalg.solve(self.L.T, np.linalg.solve(self.L, (y - self.yMean) / self.yStd))
+
+    """
+    predict
+
+    @param X: (n x d) array of points to predict
+    @return: tuple of the arrays of the predicted mean and standard deviation at each point
+    """
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        Ks = self.kernel(X, self.X)
+        mean = Ks.dot(self.alpha)
+        v = np.linalg.solve(self.L, Ks.T)
+        variance = np.clip(1.0 - (v**2).sum(axis=0), 0.0, None)
+        return mean * self.yStd + self.yMean, np.sqrt(variance) * self.yStd
+
+    """
+    kernel
+
+    @param A: (n x d) array of points
+    @param B: (m x d) array of points
+    @return: (n x m) array of the squared exponential kernel between every pair of points
+    """
+    def kernel(self, A, B):
+        sqDists = (A**2).sum(axis=1)[:, np.newaxis] + (B**2).sum(axis=1)[np.newaxis, :] - 2 * A.dot(B.T)
+        return np.exp(-0.5 * np.clip(sqDists, 0.0, None) / self.lengthScale**2)
@@ -1,4 +1,4 @@
-
+import numpy as np
 
 class HeatModel(object):
     # Idle power consumption in watts
@@ -7,14 +7,43 @@ class HeatModel(object):
     __linearTemp = 40
     # Total max consumption = idle + linear
     # i.e. __maxConsume = __idleConsume + __linearConsume
-    def __init__(self):
+
+    """
+    __init__
+
+    The temperature follows a first order RC model: while the utilization stays the same it approaches the steady state
+    temperature of that utilization exponentially, with the given time constant (R * C). Since the utilization only
+    changes at arrivals and departures the temperature is integrated in closed form between them, at O(1) per change.
+
+    @param timeConstant: thermal time constant in simulation time units -> 0 for the temperature to follow the
+                         utilization instantly
+    @return: none
+    """
+    def __init__(self, timeConstant=0.0):
         super(HeatModel, self).__init__()
+        self.timeConstant = timeConstant
 
     """
-    getPowerConsumed
+    getCurrTemp
 
     @param util: utilization to calculate temperature for
-    @return: instantaneous temperature based on utilization
+    @return: steady state temperature based on utilization, which the temperature is at instantly without thermal lag
     """
     def getCurrTemp(self, util):
         return HeatModel.__idleTemp + util * HeatModel.__linearTemp
+
+    """
+    getTempAfter
+
+    Works on scalars as well as on NumPy arrays of servers.
+
+    @param startTemp: temperature at the start of the period
+    @param util: utilization during the period
+    @param timeElapsed: duration of the period
+    @return: temperature at the end of the period
+    """
+    def getTempAfter(self, startTemp, util, timeElapsed):
+        steadyTemp = self.getCurrTemp(util)
+        if self.timeConstant <= 0:
+            return steadyTemp
+        return steadyTemp + (startTemp - steadyTemp) * np.exp(-timeElapsed / self.timeConstant)
@@ -0,0 +1,197 @@
+class IndexedHeap(object):
+
+    """
+    __init__
+
+    Initialize an indexed binary min-heap. Items are the integers 0 to size-1 (i.e. server indexes) and each item
+    can be in the heap at most once. A position map is kept alongside the heap so that the key of any item can be
+    changed or the item removed in O(log n) without searching for it.
+
+    Ties between equal keys are broken by the lower item, so the heap always returns the same item a sequential
+    scan using a strict less-than comparison would.
+
+    @param size: number of items that can be held by the heap
+    @return: none
+    """
+    def __init__(self, size):
+        super(IndexedHeap, self).__init__()
+        # Heap ordered list of items
+        self.heap = []
+        # Key for each item
+        self.keys = [None] * size
+        # Position of each item within the heap, -1 if the item is not in the heap
+        self.positions = [-1] * size
+
+# Getters
+
+    """
+    __len__
+
+    @return: number of items currently in the heap
+    """
+    def __len__(self):
+        return len(self.heap)
+
+    """
+    contains
+
+    @param item: item to look for
+    @return: True if the item is in the heap, False otherwise
+    """
+    def contains(self, item):
+        return self.positions[item] >= 0
+
+    """
+    getKey
+
+    @param item: item to get the key of
+    @return: the key of the item, None if the item is not in the heap
+    """
+    def getKey(self, item):
+        if self.positions[item] >= 0:
+            return self.keys[item]
+        return None
+
+    """
+    peek
+
+    @return: the item with the smallest key, None if the heap is empty
+    """
+    def peek(self):
+        if len(self.heap) > 0:
+            return self.heap[0]
+        return None
+
+# Functionality methods
+
+    """
+    update
+
+    Insert an item into the heap or change its key if it is already in the heap.
+
+    @param item: item to insert or update
+    @param key: new key for the item
+    @return: none
+    """
+    def update(self, item, key):
+        position = self.positions[item]
+        self.keys[item] = key
+        if position < 0:
+            self.heap.append(item)
+            self.positions[item] = len(self.heap) - 1
+            self.siftUp(len(self.heap) - 1)
+        else:
+            self.siftUp(position)
+            self.siftDown(self.positions[item])
+
+    """
+    remove
+
+    Remove an item from the heap. Removing an item that is not in the heap does nothing.
+
+    @param item: item to remove
+    @return: none
+    """
+    def remove(self, item):
+        position = self.positions[item]
+        if position < 0:
+            return
+        last = self.heap.pop()
+        self.positions[item] = -1
+        self.keys[item] = None
+        # The removed item was the last one in the heap, nothing to restore
+        if position == len(self.heap):
+            return
+        self.heap[position] = last
+        self.positions[last] = position
+        self.siftUp(position)
+        self.siftDown(self.positions[last])
+
+    """
+    pop
+
+    Remove and return the item with the smallest key.
+
+    @return: the item with the smallest key, None if the heap is empty
+    """
+    def pop(self):
+        if len(self.heap) == 0:
+            return None
+        item = self.heap[0]
+        self.remove(item)
+        return item
+
+    """
+    clear
+
+    Remove every item from the heap.
+
+    @return: none
+    """
+    def clear(self):
+        for item in self.heap:
+            self.positions[item] = -1
+            self.keys[item] = None
+        self.heap = []
+
+# Heap maintenance
+
+    """
+    isLess
+
+    @return: True if item a is ordered before item b
+    """
+    def isLess(self, a, b):
+        keyA = self.keys[a]
+        keyB = self.keys[b]
+        return keyA < keyB or (keyA == keyB and a < b)
+
+    """
+    siftUp
+
+    Move the item at the given position up until the heap property holds.
+
+    @return: none
+    """
+    def siftUp(self, position):
+        heap = self.heap
+        positions = self.positions
+        item = heap[position]
+        while position > 0:
+            parentPosition = (position - 1) >> 1
+            parent = heap[parentPosition]
+            if not self.isLess(item, parent):
+                break
+            heap[position] = parent
+            positions[parent] = position
+            position = parentPosition
+        heap[position] = item
+        positions[item] = position
+
+    """
+    siftDown
+
+    Move the item at the given position down until the heap property holds.
+
+    @return: none
+    """
+    def siftDown(self, position):
+        heap = self.heap
+        positions = self.positions
+        size = len(heap)
+        item = heap[position]
+        while True:
+            childPosition = 2 * position + 1
+            if childPosition >= size:
+                break
+            # Pick the smaller of the two children
+            if childPosition + 1 < size and self.isLess(heap[childPosition + 1], heap[childPosition]):
+                childPosition += 1
+            child = heap[childPosition]
+            if not self.isLess(child, item):
+                break
+            heap[position] = child
+            positions[child] = position
+            position = childPosition
+        heap[position] = item
+        positions[item] = position
@@ -1,6 +1,11 @@
 from sys import maxint
 
 class Job(object):
+    # Fixed set of attributes -> no per-instance __dict__
+    __slots__ = ('startTime', 'serviceStartTime', 'endTime', 'processingTime', 'requiredMIPS', 'isFinished')
+    # Class variable -> Jobs that have departed and can be reused instead of allocating new ones
+    _freeJobs = []
+
     """
     __init__
 
@@ -12,12 +17,56 @@ class Job(object):
     """
     def __init__(self, startTime, processingTime=0, mips=0):
         super(Job, self).__init__()
+        self.reset(startTime, processingTime, mips)
+
+    """
+    reset
+
+    Set the job up as a newly arrived job
+
+    @param startTime: Time at which the job entered the simulation
+    @param processingTime: Processing time the job requires
+    @param mips: MIPS the jobs requires
+    @return: none
+    """
+    def reset(self, startTime, processingTime=0, mips=0):
         self.startTime = startTime
+        self.serviceStartTime = maxint
         self.endTime = maxint
         self.processingTime = processingTime
         self.requiredMIPS = mips
         self.isFinished = False
 
+    """
+    acquire
+
+    Get a job for a new arrival, reusing a released job if one is available
+
+    @param startTime: Time at which the job entered the simulation
+    @param processingTime: Processing time the job requires
+    @param mips: MIPS the jobs requires
+    @return: a job set up with the given values
+    """
+    @staticmethod
+    def acquire(startTime, processingTime=0, mips=0):
+        if Job._freeJobs:
+            job = Job._freeJobs.pop()
+            job.reset(startTime, processingTime, mips)
+            return job
+        return Job(startTime, processingTime, mips)
+
+    """
+    release
+
+    Hand a job that is no longer referenced back for reuse by acquire
+
+    @param job: the job to release
+    @return: none
+    """
+    @staticmethod
+    def release(job):
+        Job._freeJobs.append(job)
+
 # Getters
 
     """
@@ -28,6 +77,14 @@ class Job(object):
     def getResponseTime(self):
         return self.endTime - self.startTime
 
+    """
+    getServiceStartTime
+
+    @return: time at which the server started processing the job
+    """
+    def getServiceStartTime(self):
+        return self.serviceStartTime
+
     """
     getProcessingTime
 
@@ -64,6 +121,15 @@ class Job(object):
     def setEndTime(self, endTime):
         self.endTime = endTime
 
+    """
+    setServiceStartTime
+
+    @param serviceStartTime: set the time at which the server started processing the job
+    @return: none
+    """
+    def setServiceStartTime(self, serviceStartTime):
+        self.serviceStartTime = serviceStartTime
+
     """
     setProcessingTime
 
@@ -0,0 +1,121 @@
+import numpy as np
+from threading import Thread
+from Queue import Queue
+
+class JobEventLog(object):
+
+    # Columns of the records -> one record per finished job
+    _COLUMNS = ('repetition', 'arrival', 'start', 'end', 'server', 'mips', 'responseTime')
+
+    """
+    __init__
+
+    Initialize a log of the jobs finished by the servers. Each record holds the repetition, the arrival, start of
+    processing and end times, the index of the server, the MIPS and the response time of a job. Records are written into
+    a preallocated NumPy buffer of chunkSize rows; a full buffer is handed to a background thread which writes it to
+    disk as a compressed columnar .npz file (pathPrefix_00000.npz, pathPrefix_00001.npz, ...) while a new buffer is
+    filled, so logging costs a constant amount per job and no job objects are kept.
+
+    @param pathPrefix: path prefix of the chunk files
+    @param chunkSize: number of records per chunk file
+    @return: none
+    """
+    def __init__(self, pathPrefix, chunkSize=65536):
+        super(JobEventLog, self).__init__()
+        self.pathPrefix = pathPrefix
+        self.chunkSize = chunkSize
+        self.repetition = 0
+        self.buffer = np.empty((chunkSize, len(JobEventLog._COLUMNS)))
+        self.numRecords = 0
+        self.numChunks = 0
+        self.paths = []
+        # Chunks waiting to be written by the writer thread -> None stops the thread
+        self.pending = Queue()
+        self.writer = Thread(target=self.writeChunks)
+        self.writer.daemon = True
+        self.writer.start()
+
+# Getters
+
+    """
+    getPaths
+
+    @return: list of the paths of the chunk files written or being written
+    """
+    def getPaths(self):
+        return self.paths
+
+# Setters
+
+    """
+    setRepetition
+
+    @param repetition: index of the repetition the following records belong to
+    @return: none
+    """
+    def setRepetition(self, repetition):
+        self.repetition = repetition
+
+# Functionality methods
+
+    """
+    record
+
+    Add the record of a finished job, handing the buffer over to be written once it is full.
+
+    @param arrival: time at which the job arrived
+    @param start: time at which the server started processing the job
+    @param end: time at which the job finished
+    @param server: index of the server that processed the job
+    @param mips: MIPS required by the job
+    @return: none
+    """
+    def record(self, arrival, start, end, server, mips):
+        self.buffer[self.numRecords] = (self.repetition, arrival, start, end, server, mips, end - arrival)
+        self.numRecords += 1
+        if self.numRecords == self.chunkSize:
+            self.flush()
+
+    """
+    flush
+
+    Hand the records in the buffer over to the writer thread and start a new buffer.
+
+    @return: none
+    """
+    def flush(self):
+        if self.numRecords > 0:
+            path = '%s_%05d.npz' % (self.pathPrefix, self.numChunks)
+            self.paths.append(path)
+            self.pending.put((path, self.buffer[:self.numRecords]))
+            self.numChunks += 1
+            self.buffer = np.empty((self.chunkSize, len(JobEventLog._COLUMNS)))
+            self.numRecords = 0
+
+    """
+    close
+
+    Write the remaining records and wait until every chunk file has been written.
+
+    @return: none
+    """
+    def close(self):
+        self.flush()
+        self.pending.put(None)
+        self.writer.join()
+
+    """
+    writeChunks
+
+    Write the chunks handed over by flush as compressed columnar .npz files, run by the writer thread.
+
+    @return: none
+    """
+    def writeChunks(self):
+        while True:
+            chunk = self.pending.get()
+            if chunk is None:
+                return
+            path, records = chunk
+            columns = dict((name, records[:, i]) for i, name in enumerate(JobEventLog._COLUMNS))
+            np.savez_compressed(path, **columns)
@@ -4,6 +4,17 @@ from Simulator import Simulator
 from math import sqrt, exp, ceil, floor
 # Import the necessary system value
 from sys import maxint
+# Import the process pool used to evaluate candidates concurrently
+from multiprocessing import Pool
+# Import the generator used to pick a seed shared by the candidates
+from random import SystemRandom
+# Import the analytic model used to prescreen candidates
+from QueueingModel import QueueingModel
+# Import the surrogate model and the arrays used by the surrogate optimizer
+from GaussianProcess import GaussianProcess
+import numpy as np
+# Import the persistent cache of simulation results
+from ResultCache import ResultCache
 ############################<<PARAMS>>############################
 # Params: Simulator -> Set by user
 mu                = 1
@@ -28,6 +39,40 @@ alphaMin          = 1
 alphaMax          = numServers
 tolerance         = 2
 numRepsGSS        = 100
+# Params: Ranking and selection
+confidenceRS      = 0.95
+#       Indifference zone -> fraction of the lowest first stage mean penalty that counts as a practical difference
+indifferenceZone  = 0.10
+initialRepsRS     = 10
+maxRepsRS         = 200
+# Params: Surrogate optimizer -> ranges of the number of servers, servers turned on initially and routing threshold
+numServersRangeBO = (5, 50)
+toTurnOnRangeBO   = (1, 50)
+upperBoundUtilRangeBO = (0.5, 1.0)
+#       Step of the grid the routing threshold is snapped to, so that nearby thresholds aren't simulated again
+upperBoundUtilStepBO = 0.05
+initialPointsBO   = 8
+numEvaluationsBO  = 30
+numCandidatesBO   = 2000
+# Params: Result cache -> path of the SQLite file simulation results are kept in across runs, None for no cache
+cachePath         = None
+resultCache       = ResultCache(cachePath) if cachePath is not None else None
+#       Seed used with the cache when seedSim isn't set -> results only hit across runs with the same seed
+cacheSeed         = 1
+# Params: Optimizer -> 'GSS' for the golden section search, 'RS' for ranking and selection, 'BO' for the surrogate
+optimizer         = 'GSS'
+# Params: Evaluation
+seedSim           = None
+#       Common random numbers -> every candidate's rep k sees the same arrivals, processing times and MIPS, off by
+#       default so that runs without a seedSim draw a seed per candidate as before
+commonRandomNumbers = False
+numWorkersGSS     = 2
+# Params: Warm start -> candidates continue from a shared warmed up state instead of an empty system when above 0
+warmupTime        = 0
+warmupTurnOn      = alphaMin
+# Params: Analytic prescreen -> M/M/c estimates are reported and checked against the DES penalties, never used to prune
+analyticPrescreen = False
+disagreementTolerance = 0.5
 ##################################################################
 
 """
@@ -42,68 +87,228 @@ This function aims to take in a set of parameters, run a DES simulation, and ret
 @param numReps: number of repetitions the simulator will run for
 @param maxMIPS: the maximum number of millions of instructions per second (MIPS) that a job can reach
 @param aggressivness: the aggressivness parameter determines the number of servers that are initially turned on within the simulator
+@param seed: seed for the simulator -> a random seed is chosen by the simulator if unspecified
+@param upperBoundUtil: utilization at or above which the routing policy takes a server out of consideration
 @return: the total penalty score of the simulation results
 """
-def penaltyFunction(lamb, mu, numServers, simTime, numReps, maxMIPS, aggressivness):
-    mySim = Simulator(lam, mu, numServers, simTime, numRepsSim, maxMIPS, aggressivness)
-    mySim.runSimulation()
-    totalPenalty = 0
-
-    maxTemps                = mySim.getMaxTemps()
-    responseTimes           = mySim.getAvgResponseTime()
-    avgjobsinsys            = mySim.getAvgJobsInSimulation()
-    avgUtilizations         = mySim.getAvgServerUtils()
-    powerConsumedByServers  = mySim.getPowerConsumptions()
-
-    for rep in powerConsumedByServers:
-        repIndex = powerConsumedByServers.index(rep)
-
-        print '*****************************************************'
-        print 'Log dump for rep', repIndex+1
-        print 'Avg avg utils: ', sum(avgUtilizations[repIndex]) / len(avgUtilizations[repIndex])
-        print 'Avg power consumed', sum(powerConsumedByServers[repIndex]) / len(powerConsumedByServers[repIndex])
-        print 'Avg Response Time', sum(responseTimes[repIndex]) / len(responseTimes[repIndex])
-        for i in range(0, len(rep)):
-            print 'Server', i, '\tUtil:', avgUtilizations[repIndex][i], '\tMax temp:', maxTemps[repIndex][i],  '\t\tConsumed:', powerConsumedByServers[repIndex][i], '\tRT:', responseTimes[repIndex][i]
-
-        maxTempForRep      = max(maxTemps[repIndex])
-        maxPowerConsForRep = max(powerConsumedByServers[repIndex])
-        maxUtilForRep      = max(avgUtilizations[repIndex])
-        maxRTForRep        = max(responseTimes[repIndex])
-
-        # Huge penalties for infeasible solutions
-        if maxTempForRep > maxTemperature:
-            totalPenalty += maxTempForRep
-        if maxUtilForRep > maxUtilization:
-            totalPenalty += maxUtilForRep
-        if maxRTForRep > maxResponseTime:
-            totalPenalty += maxRTForRep
-
-        # Calculate norms against the maximums for each list
-        # No actual use for this, penalties wouldn't make sense since the normalized scores can only be compared relative to the max...
-        # normMaxTemps        = [float(i)/maxTempForRep for i in maxTemps[repIndex]].sort(reverse=True)
-        # normPowerConsumed   = [float(i)/maxPowerConsForRep for i in powerConsumedByServers[repIndex]].sort(reverse=True)
-        # normAvgUtils        = [float(i)/maxUtilForRep for i in avgUtilizations[repIndex]].sort(reverse=True)
-        # normResponseTimes   = [float(i)/maxRTForRep for i in responseTimes[repIndex]].sort(reverse=True)
-
-        avgMaxTempForRep    = sum(maxTemps[repIndex]) / len(maxTemps[repIndex])
-        avgPowerConsForRep  = sum(powerConsumedByServers[repIndex]) / len(powerConsumedByServers[repIndex])
-        avgUtilForRep       = sum(avgUtilizations[repIndex]) / len(avgUtilizations[repIndex])
-        avgRTForRep         = sum(responseTimes[repIndex]) / len(responseTimes[repIndex])
-
-        for item in rep:
-            itemIndex = rep.index(item)
-            if maxTemps[repIndex][itemIndex] > avgMaxTempForRep:
-                totalPenalty += maxTemps[repIndex][itemIndex] - avgMaxTempForRep
-            if powerConsumedByServers[repIndex][itemIndex] > avgPowerConsForRep:
-                totalPenalty += powerConsumedByServers[repIndex][itemIndex] - avgPowerConsForRep
-            if avgUtilizations[repIndex][itemIndex] > avgUtilForRep:
-                totalPenalty += avgUtilizations[repIndex][itemIndex] - avgUtilForRep
-            if responseTimes[repIndex][itemIndex] > avgRTForRep:
-                totalPenalty += responseTimes[repIndex][itemIndex] - avgRTForRep
-        # ENDFOR
-    return totalPenalty
+def penaltyFunction(lamb, mu, numServers, simTime, numReps, maxMIPS, aggressivness, seed=None, upperBoundUtil=0.9):
+    mySim = Simulator(lamb, mu, numServers, simTime, numReps, maxMIPS, aggressivness, seed=seed,
+                      upperBoundUtil=upperBoundUtil, resultCache=resultCache)
+    if warmupTime > 0:
+        for simNumber in range(0, numReps):
+            warmSim = Simulator.fromCheckpoint(getWarmState(lamb, mu, numServers, simTime, maxMIPS, seed, simNumber))
+            warmSim.setUpperBoundUtil(upperBoundUtil)
+            mySim.addRepetitionResults(warmSim.continueRepetition(aggressivness))
+    else:
+        mySim.runSimulation()
+    return getPenalty(mySim)
 
+"""
+repetitionPenalty
+
+Run a single repetition of a DES simulation and return its penalty score. Repetition simNumber of a simulator with
+the given seed is run, so it is the same repetition a full run with that seed would make.
+
+@param lamb: the interarrival rate for the simulator
+@param mu: the job size parameter for the simulator
+@param numServers: number of servers that the simulator will contain
+@param simTime: the number of time units the simulator is alloted to run for
+@param maxMIPS: the maximum number of millions of instructions per second (MIPS) that a job can reach
+@param aggressivness: the aggressivness parameter determines the number of servers that are initially turned on within the simulator
+@param seed: seed for the simulator -> a random seed is chosen by the simulator if unspecified
+@param simNumber: index of the repetition to run
+@return: the penalty score of the repetition
+"""
+def repetitionPenalty(lamb, mu, numServers, simTime, maxMIPS, aggressivness, seed, simNumber):
+    if warmupTime > 0:
+        mySim = Simulator.fromCheckpoint(getWarmState(lamb, mu, numServers, simTime, maxMIPS, seed, simNumber))
+        mySim.continueRepetition(aggressivness)
+    else:
+        mySim = Simulator(lamb, mu, numServers, simTime, 1, maxMIPS, aggressivness, seed=seed)
+        mySim.runRepetition(simNumber)
+    return getPenalty(mySim, False)
+
+# Checkpoints of warmed up repetitions -> keyed by the simulator parameters, seed and repetition
+warmStates = {}
+
+"""
+getWarmState
+
+Get the checkpoint of a repetition that has been warmed up for warmupTime with warmupTurnOn servers turned on, warming
+it up first if it isn't in warmStates yet. Every candidate continues from the same warmed up state, turning on its own
+number of servers, so the warm-up is only paid for once per repetition.
+
+@param lamb: the interarrival rate for the simulator
+@param mu: the job size parameter for the simulator
+@param numServers: number of servers that the simulator will contain
+@param simTime: the number of time units the simulator runs for after the warm-up
+@param maxMIPS: the maximum number of millions of instructions per second (MIPS) that a job can reach
+@param seed: seed for the simulator -> a random seed is chosen by the simulator if unspecified
+@param simNumber: index of the repetition
+@return: the checkpoint of the warmed up simulator
+"""
+def getWarmState(lamb, mu, numServers, simTime, maxMIPS, seed, simNumber):
+    key = (lamb, mu, numServers, simTime, maxMIPS, seed, simNumber)
+    if key not in warmStates:
+        mySim = Simulator(lamb, mu, numServers, simTime, 1, maxMIPS, warmupTurnOn, seed=seed)
+        mySim.warmUp(simNumber, warmupTime)
+        warmStates[key] = mySim.checkpoint()
+    return warmStates[key]
+
+"""
+getPenalty
+
+Calculate the penalty score of the results of a simulator that has been run.
+
+@param mySim: the simulator
+@param printLog: True to print a log dump of the results of each repetition
+@return: the total penalty score of the simulation results
+"""
+def getPenalty(mySim, printLog=True):
+    results = mySim.getResults()
+
+    if printLog:
+        for repIndex in range(0, results.getNumReps()):
+            print '*****************************************************'
+            print 'Log dump for rep', repIndex+1
+            print 'Avg avg utils: ', results.utilization[repIndex].mean()
+            print 'Avg power consumed', results.energy[repIndex].mean()
+            print 'Avg Response Time', results.responseTime[repIndex].mean()
+            for i in range(0, results.getNumServers()):
+                print 'Server', i, '\tUtil:', results.utilization[repIndex][i], '\tMax temp:', results.maxTemp[repIndex][i],  '\t\tConsumed:', results.energy[repIndex][i], '\tRT:', results.responseTime[repIndex][i]
+
+    return results.getPenalty(maxTemperature, maxUtilization, maxResponseTime)
+
+
+# Penalties already evaluated -> keyed by the full tuple of penaltyFunction arguments including the seed
+penaltyCache = {}
+
+"""
+evaluateCall
+
+Call a function on a tuple of arguments given as a single (function, args) tuple, so that calls can be mapped over a
+process pool.
+
+@param call: tuple of a module level function and the tuple of its arguments
+@return: the value returned by the function
+"""
+def evaluateCall(call):
+    function, args = call
+    return function(*args)
+
+"""
+runConcurrently
+
+Call a function on each tuple of arguments. When there is more than one call they are run concurrently on up to
+numWorkersGSS processes.
+
+@param function: module level function to call
+@param argsList: list of tuples of arguments
+@return: list of the values returned for each tuple in the same order
+"""
+def runConcurrently(function, argsList):
+    calls = [(function, args) for args in argsList]
+    if len(calls) > 1 and numWorkersGSS > 1:
+        pool = Pool(min(numWorkersGSS, len(calls)))
+        try:
+            return pool.map(evaluateCall, calls)
+        finally:
+            pool.close()
+            pool.join()
+    return [evaluateCall(call) for call in calls]
+
+"""
+evaluatePenalties
+
+Determine the penalty for each of the given parameter tuples. Penalties already in penaltyCache are reused instead
+of running the simulation again, which happens often since the candidate points are floored and ceiled onto the
+integer aggressivness axis. The penalties that need to be evaluated are run concurrently (see runConcurrently).
+
+@param argsList: list of tuples of penaltyFunction arguments
+@return: list of the penalties for each tuple in the same order
+"""
+def evaluatePenalties(argsList):
+    missing = []
+    for args in argsList:
+        if args not in penaltyCache and args not in missing:
+            missing.append(args)
+    if warmupTime > 0:
+        # Warm up in this process so that the worker processes inherit the warmed up states
+        for args in missing:
+            lamb, mu, numServers, simTime, numReps, maxMIPS, aggressivness, seed = args[:8]
+            for simNumber in range(0, numReps):
+                getWarmState(lamb, mu, numServers, simTime, maxMIPS, seed, simNumber)
+    penalties = runConcurrently(penaltyFunction, missing)
+    for args, penalty in zip(missing, penalties):
+        penaltyCache[args] = penalty
+        if analyticPrescreen:
+            lamb, mu, numServers, simTime, numReps, maxMIPS, aggressivness, seed = args[:8]
+            checkAnalyticEstimate(QueueingModel(lamb, mu, numServers, simTime), aggressivness, numReps, penalty)
+    return [penaltyCache[args] for args in argsList]
+
+"""
+prescreenBracket
+
+Report what the analytic M/M/c model makes of the search bracket: the smallest number of servers it finds feasible for
+maxResponseTime and maxUtilization, and the candidate it estimates best. The model takes the servers turned on
+initially as the c servers that stay on, while the simulator turns servers on and off under its routing policy, so the
+model can rank the candidates the opposite way round from the DES. Its estimates are therefore only reported, and
+checked against the DES penalties as they come in (see checkAnalyticEstimate), and the bracket is never shrunk.
+
+@param model: QueueingModel of the simulation
+@param alphaMin: the lowerbound of the search space
+@param alphaMax: the upperbound of the search space
+@return: none
+"""
+def prescreenBracket(model, alphaMin, alphaMax):
+    candidates = range(int(ceil(alphaMin)), int(alphaMax) + 1)
+    feasible = [c for c in candidates if model.isFeasible(c, maxResponseTime, maxUtilization)]
+    if feasible:
+        print 'Analytic prescreen: the model finds', feasible[0], 'or more servers feasible'
+    else:
+        print 'Analytic prescreen: the model finds no candidate feasible'
+    best = min(candidates, key=lambda c: model.getPenalty(c, 1, maxTemperature, maxUtilization, maxResponseTime))
+    print 'Analytic prescreen: the model estimates x =', best, 'best, the bracket is left as is'
+
+"""
+checkAnalyticEstimate
+
+Flag a candidate whose DES penalty is more than disagreementTolerance away from the analytic estimate, relative to the
+larger of the two.
+
+@param model: QueueingModel of the simulation
+@param aggressivness: the number of servers turned on for the candidate
+@param numReps: number of repetitions the DES penalty was summed over
+@param penalty: penalty score given by the DES
+@return: True if the estimate and the DES disagree
+"""
+def checkAnalyticEstimate(model, aggressivness, numReps, penalty):
+    estimate = model.getPenalty(aggressivness, numReps, maxTemperature, maxUtilization, maxResponseTime)
+    if abs(estimate - penalty) > disagreementTolerance * max(abs(estimate), abs(penalty)):
+        print 'Analytic estimate disagrees with the DES for x =', aggressivness, ':', round(estimate, 2), 'vs', round(penalty, 2)
+        return True
+    return False
+
+"""
+getSearchSeed
+
+Determine the seed used for the candidates of a search. With commonRandomNumbers every candidate is simulated with
+the same seed, so rep k of each candidate sees identical arrival, processing time and MIPS streams and only the number
+of servers turned on initially differs. Comparisons between candidates are then far less noisy for the same number of
+replications. Without it each candidate draws its own random seed, unless seedSim fixes it.
+
+A cached result is keyed on its seed, so a fresh seed per search would never hit the results of earlier runs. With a
+result cache and no seedSim the search uses the fixed cacheSeed instead.
+
+@return: seed shared by the candidates, None to have each simulation pick its own
+"""
+def getSearchSeed():
+    if seedSim is None and resultCache is not None:
+        print 'seedSim is not set, using cacheSeed', cacheSeed, '-> the cache only hits across runs with the same seed'
+        return cacheSeed
+    if seedSim is None and commonRandomNumbers:
+        return SystemRandom().randint(0, 2**32 - 1)
+    return seedSim
 
 """
 optimizerGSS
@@ -118,11 +323,15 @@ the optimizerGSS used the golden section search to optimize the number of server
 @return: none -- prints results in console or whever the results are piped to
 """
 def optimizerGSS(alphaMin, alphaMax, tolerance, numReps, numServers):
+    seed = getSearchSeed()
+    print 'Seed:', seed
+    if analyticPrescreen:
+        prescreenBracket(QueueingModel(lam, mu, numServers, simTime), alphaMin, alphaMax)
     print " x1\t x2\t    fx1\t\t   fx2\t\t b-a"
     x1 = floor(phi*alphaMin + (1-phi)*alphaMax)
     x2 = ceil((1-phi)*alphaMin + phi*alphaMax)
-    fx1 = penaltyFunction(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x1)
-    fx2 = penaltyFunction(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x2)
+    fx1, fx2 = evaluatePenalties([(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x1, seed),
+                                  (lam, mu, numServers, simTime, numRepsSim, maxMIPS, x2, seed)])
     numIters = 1
     lastDiff = maxint
     for i in range(1, numReps):
@@ -133,14 +342,14 @@ def optimizerGSS(alphaMin, alphaMax, tolerance, numReps, numServers):
             x2 = x1
             fx2 = fx1
             x1 = floor(phi*alphaMin + (1-phi)*alphaMax)
-            fx1 = penaltyFunction(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x1)
+            fx1, = evaluatePenalties([(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x1, seed)])
         # Search space is now in the upper two thirds of the previous iteration
         else:
             alphaMin = x1
             x1 = x2
             fx1 = fx2
             x2 = ceil((1-phi)*alphaMin + phi*alphaMax)
-            fx2 = penaltyFunction(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x2)
+            fx2, = evaluatePenalties([(lam, mu, numServers, simTime, numRepsSim, maxMIPS, x2, seed)])
         numIters = numIters + 1
         currDiff = abs(alphaMax - alphaMin)
         # Check for convergence
@@ -171,4 +380,182 @@ def optimizerGSS(alphaMin, alphaMax, tolerance, numReps, numServers):
     print '--------------------------------\n'
 # End function
 
-optimizerGSS(alphaMin, alphaMax, tolerance, numRepsGSS, numServers)
+"""
+optimizerRS
+
+The optimizerRS uses a fully sequential ranking and selection procedure (Kim and Nelson's KN procedure) to find the number
+of servers to turn on with the lowest expected penalty among every integer from alphaMin to alphaMax. Unlike the golden
+section search it doesn't assume the penalty is unimodal or free of noise.
+
+Every candidate is first simulated for initialRepsRS repetitions, from which the variances of the differences between
+candidates are estimated. One more repetition is then added to each candidate still in contention at a time, and a
+candidate is dropped as soon as its mean penalty is clearly worse than that of another. The indifference zone is
+relative to the scale of the penalties, indifferenceZone times the lowest mean penalty of the first stage, and with
+probability at least confidenceRS the candidate left is the best or within it of the best. If more than one candidate
+is left after maxRepsRS repetitions the candidates couldn't be told apart, which is reported instead of an optimum.
+The repetitions of each stage are run concurrently (see runConcurrently).
+
+@param alphaMin: the lowest number of servers to consider
+@param alphaMax: the highest number of servers to consider
+@param numServers: the maximum number of servers allowable
+
+@return: none -- prints results in console or whever the results are piped to
+"""
+def optimizerRS(alphaMin, alphaMax, numServers):
+    seed = getSearchSeed()
+    print 'Seed:', seed
+    if analyticPrescreen:
+        model = QueueingModel(lam, mu, numServers, simTime)
+        prescreenBracket(model, alphaMin, alphaMax)
+    candidates = [float(x) for x in range(int(alphaMin), int(alphaMax) + 1)]
+    numCandidates = len(candidates)
+    # First stage -> initialRepsRS repetitions of every candidate
+    argsList = [(lam, mu, numServers, simTime, maxMIPS, x, seed, r) for x in candidates for r in range(0, initialRepsRS)]
+    if warmupTime > 0:
+        # Warm up in this process so that the worker processes inherit the warmed up states
+        for r in range(0, initialRepsRS):
+            getWarmState(lam, mu, numServers, simTime, maxMIPS, seed, r)
+    firstStage = runConcurrently(repetitionPenalty, argsList)
+    penalties = {}
+    for i in range(0, numCandidates):
+        penalties[candidates[i]] = firstStage[i*initialRepsRS:(i+1)*initialRepsRS]
+        if analyticPrescreen:
+            checkAnalyticEstimate(model, candidates[i], initialRepsRS, sum(penalties[candidates[i]]))
+    # Variances of the differences between each pair of candidates over the first stage
+    variances = {}
+    for x in candidates:
+        for y in candidates:
+            if x != y:
+                diffs = [a - b for a, b in zip(penalties[x], penalties[y])]
+                meanDiff = sum(diffs) / len(diffs)
+                variances[(x, y)] = sum((d - meanDiff)**2 for d in diffs) / (len(diffs) - 1)
+    # Indifference zone in the units of the penalty
+    delta = indifferenceZone * min(sum(penalties[x]) / initialRepsRS for x in candidates)
+    print 'Indifference zone:', round(delta, 2)
+    # Continuation region constant
+    if numCandidates > 1:
+        eta = 0.5 * ((2 * (1 - confidenceRS) / (numCandidates - 1))**(-2.0 / (initialRepsRS - 1)) - 1)
+    else:
+        eta = 0.0
+    hSquared = 2 * eta * (initialRepsRS - 1)
+    contenders = list(candidates)
+    numRepsDone = initialRepsRS
+    print ' reps	contenders'
+    while True:
+        print '%5d\t%d' % (numRepsDone, len(contenders))
+        means = dict((x, sum(penalties[x]) / len(penalties[x])) for x in contenders)
+        survivors = []
+        for x in contenders:
+            dominated = False
+            for y in contenders:
+                if x != y:
+                    halfWidth = max(0.0, delta / (2 * numRepsDone) *
+                                    (hSquared * variances[(x, y)] / delta**2 - numRepsDone))
+                    if means[x] > means[y] + halfWidth:
+                        dominated = True
+                        break
+            if not dominated:
+                survivors.append(x)
+        contenders = survivors
+        if len(contenders) == 1 or numRepsDone >= maxRepsRS:
+            break
+        # Next stage -> one more repetition for every candidate still in contention
+        argsList = [(lam, mu, numServers, simTime, maxMIPS, x, seed, numRepsDone) for x in contenders]
+        if warmupTime > 0:
+            getWarmState(lam, mu, numServers, simTime, maxMIPS, seed, numRepsDone)
+        for x, penalty in zip(contenders, runConcurrently(repetitionPenalty, argsList)):
+            penalties[x].append(penalty)
+        numRepsDone += 1
+    print '\n----------FINAL DUMP-----------'
+    if len(contenders) == 1:
+        print '  x =', contenders[0]
+        print ' fx =', sum(penalties[contenders[0]]) / len(penalties[contenders[0]])
+    else:
+        for x in contenders:
+            print '  x =', x, '\tfx =', sum(penalties[x]) / len(penalties[x])
+        print 'NO separation of', len(contenders), 'contenders after', numRepsDone, 'repetitions...'
+    print 'Simulated', sum(len(reps) for reps in penalties.values()), 'repetitions...'
+    print '--------------------------------\n'
+# End function
+
+"""
+optimizerBO
+
+The optimizerBO tunes the number of servers, the number of servers turned on initially and the routing policy's
+upperBoundUtil together using Bayesian optimization. The penalty sums over the servers, so the objective is the penalty
+per server, which can be compared across numbers of servers. A Gaussian process surrogate is fitted to the log of the
+objectives evaluated so far, and the next point simulated is the one, among numCandidatesBO random points not evaluated
+yet, with the highest expected improvement over the best objective found. The routing threshold is snapped to a grid of
+upperBoundUtilStepBO so that points differing only by a sliver of it count as the same point. After initialPointsBO
+random points, one point is simulated at a time until numEvaluationsBO points have been evaluated, or until no new
+point is drawn. The arrival rate stays at lam for every number of servers.
+
+@param seed: seed shared by the simulations, see getSearchSeed
+
+@return: none -- prints results in console or whever the results are piped to
+"""
+def optimizerBO(seed):
+    print 'Seed:', seed
+    generator = np.random.RandomState(seed)
+    lower = np.array([numServersRangeBO[0], toTurnOnRangeBO[0], upperBoundUtilRangeBO[0]], dtype=np.float64)
+    upper = np.array([numServersRangeBO[1], toTurnOnRangeBO[1], upperBoundUtilRangeBO[1]], dtype=np.float64)
+
+    # Random points in the ranges, rounded onto the integer knobs and the threshold grid, and scaled to [0, 1] for the
+    # surrogate
+    def samplePoints(numPoints):
+        points = lower + generator.random_sample((numPoints, 3)) * (upper - lower)
+        points[:, :2] = np.round(points[:, :2])
+        points[:, 2] = np.round(points[:, 2] / upperBoundUtilStepBO) * upperBoundUtilStepBO
+        # Can't turn on more servers than there are
+        points[:, 1] = np.minimum(points[:, 1], points[:, 0])
+        return points
+
+    # Points drawn that haven't been evaluated yet, each of them once
+    def getNewPoints(points, observed):
+        newPoints = []
+        seen = set(observed)
+        for p in points:
+            if tuple(p) not in seen:
+                seen.add(tuple(p))
+                newPoints.append(p)
+        return np.array(newPoints).reshape((len(newPoints), 3))
+
+    def evaluatePoints(points):
+        penalties = evaluatePenalties([(lam, mu, int(p[0]), simTime, numRepsSim, maxMIPS, float(p[1]), seed,
+                                        float(p[2])) for p in points])
+        for p, penalty in zip(points, penalties):
+            print '%8d\t%3d\t%9.3f\t%8.2f\t%8.2f' % (p[0], p[1], p[2], penalty, penalty / p[0])
+        return penalties
+
+    print ' servers\t on\tthreshold\t penalty\t per server'
+    points = getNewPoints(samplePoints(initialPointsBO), set())
+    penalties = evaluatePoints(points)
+    surrogate = GaussianProcess()
+    while len(penalties) < numEvaluationsBO:
+        objectives = np.array(penalties) / points[:, 0]
+        surrogate.fit((points - lower) / (upper - lower), np.log1p(objectives))
+        candidates = getNewPoints(samplePoints(numCandidatesBO), set(tuple(p) for p in points))
+        if len(candidates) == 0:
+            print 'Every point drawn has been evaluated already...'
+            break
+        expected = surrogate.getExpectedImprovement((candidates - lower) / (upper - lower), np.log1p(objectives.min()))
+        nextPoint = candidates[np.argmax(expected)]
+        penalties.extend(evaluatePoints([nextPoint]))
+        points = np.vstack((points, nextPoint))
+    best = int(np.argmin(np.array(penalties) / points[:, 0]))
+    print '\n----------FINAL DUMP-----------'
+    print 'numServers     =', int(points[best][0])
+    print 'toTurnOn       =', int(points[best][1])
+    print 'upperBoundUtil =', round(points[best][2], 3)
+    print 'penalty        =', penalties[best]
+    print 'per server     =', penalties[best] / points[best][0]
+    print 'Evaluated', len(penalties), 'points...'
+    print '--------------------------------\n'
+# End function
+
+if optimizer == 'RS':
+    optimizerRS(alphaMin, alphaMax, numServers)
+elif optimizer == 'BO':
+    optimizerBO(getSearchSeed())
+else:
+    optimizerGSS(alphaMin, alphaMax, tolerance, numRepsGSS, numServers)
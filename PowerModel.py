@@ -9,9 +9,30 @@ class PowerModel(object):
     # i.e. __maxConsume = __idleConsume + __linearConsume
     # Source:
     # https://software.intel.com/sites/default/files/m/d/4/1/d/8/power_consumption.pdf
-    def __init__(self):
+
+    """
+    __init__
+
+    The defaults model a server that is on. Other power states (i.e. sleep states) draw a constant power, given as
+    their idle consumption with no linear consumption.
+
+    @param idleConsume: power consumption in watts at 0% utilization
+    @param linearConsume: power consumption in watts added at 100% utilization
+    @return: none
+    """
+    def __init__(self, idleConsume=__idleConsume, linearConsume=__linearConsume):
         super(PowerModel, self).__init__()
+        self.idleConsume = idleConsume
+        self.linearConsume = linearConsume
+
+    """
+    getPower
 
+    @param util: utilization to calculate the power for
+    @return: the power drawn at the utilization in watts
+    """
+    def getPower(self, util):
+        return self.idleConsume + self.linearConsume * util
 
     """
     getPowerConsumed
@@ -21,5 +42,5 @@ class PowerModel(object):
     @return: the power consumption based on the utilization over the elapsed time
     """
     def getPowerConsumed(self, util, timeElapsed):
-        powerAtUtil = PowerModel.__idleConsume + PowerModel.__linearConsume * util
+        powerAtUtil = self.idleConsume + self.linearConsume * util
         return timeElapsed * powerAtUtil
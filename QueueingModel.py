@@ -0,0 +1,133 @@
+from PowerModel import PowerModel
+from HeatModel import HeatModel
+from sys import maxint
+
+class QueueingModel(object):
+
+    """
+    __init__
+
+    Initialize an analytic model of the data center as an M/M/c queue, used to score a number of servers turned on in
+    microseconds instead of running the DES. The response time comes from the Erlang C formula, and the energy and
+    temperature from the linear PowerModel and HeatModel at the average job utilization. The c servers that are on
+    share the load evenly and the remaining servers stay off. The simulator doesn't keep to c servers, it turns them on
+    and off under its routing policy, so the estimates are only compared with the DES and not used to prune candidates.
+
+    @param lamb: the interarrival rate for the simulator
+    @param mu: the job size parameter for the simulator
+    @param numServers: number of servers that the simulator contains
+    @param simTime: the number of time units the simulator runs for
+    @return: none
+    """
+    def __init__(self, lamb, mu, numServers, simTime):
+        super(QueueingModel, self).__init__()
+        self.lamb = float(lamb)
+        self.mu = float(mu)
+        self.numServers = numServers
+        self.simTime = simTime
+        self.powerModel = PowerModel()
+        self.heatModel = HeatModel()
+        # Jobs require lambda / numServers of a server's capacity on average, and up to 40% more (see VariateSupplier)
+        self.jobUtil = min(1.0, self.lamb / numServers)
+        self.maxJobUtil = min(1.0, 1.4 * self.jobUtil)
+
+# Getters
+
+    """
+    getErlangC
+
+    @param c: number of servers on
+    @return: probability that an arriving job has to wait, 1 if the servers can't keep up with the arrivals
+    """
+    def getErlangC(self, c):
+        load = self.lamb / self.mu
+        if c <= load:
+            return 1.0
+        # Erlang B by recursion, which stays numerically stable for large c
+        erlangB = 1.0
+        for k in range(1, c + 1):
+            erlangB = load * erlangB / (k + load * erlangB)
+        return c * erlangB / (c - load * (1 - erlangB))
+
+    """
+    getServerUtilization
+
+    @param c: number of servers on
+    @return: fraction of the time each server that is on is busy
+    """
+    def getServerUtilization(self, c):
+        return min(1.0, self.lamb / (c * self.mu))
+
+    """
+    getResponseTime
+
+    @param c: number of servers on
+    @return: mean response time of a job, maxint if the servers can't keep up with the arrivals
+    """
+    def getResponseTime(self, c):
+        if c * self.mu <= self.lamb:
+            return maxint
+        return self.getErlangC(c) / (c * self.mu - self.lamb) + 1 / self.mu
+
+    """
+    getEnergy
+
+    @param c: number of servers on
+    @return: energy consumed by each server that is on over the simulation, which only consumes while it has jobs
+    """
+    def getEnergy(self, c):
+        return self.powerModel.getPowerConsumed(self.jobUtil, self.getServerUtilization(c) * self.simTime)
+
+    """
+    getMaxTemp
+
+    @return: maximum temperature reached by a server that is on
+    """
+    def getMaxTemp(self):
+        return self.heatModel.getCurrTemp(self.maxJobUtil)
+
+# Functionality methods
+
+    """
+    isFeasible
+
+    @param c: number of servers on
+    @param maxResponseTime: highest acceptable average response time of a server
+    @param maxUtilization: highest acceptable average utilization of a server
+    @return: True if c servers keep the response time and utilization within the limits
+    """
+    def isFeasible(self, c, maxResponseTime, maxUtilization):
+        return self.getResponseTime(c) <= maxResponseTime and self.jobUtil <= maxUtilization
+
+    """
+    getPenalty
+
+    Estimate the penalty score the DES would give to c servers being on, the same way SimulationResults.getPenalty does:
+    the limits that are exceeded, and how far the c servers that are on are above the average over all of the servers.
+
+    @param c: number of servers on
+    @param numReps: number of repetitions the penalty is summed over
+    @param maxTemperature: highest acceptable maximum temperature of a server
+    @param maxUtilization: highest acceptable average utilization of a server
+    @param maxResponseTime: highest acceptable average response time of a server
+    @return: the estimated total penalty score
+    """
+    def getPenalty(self, c, numReps, maxTemperature, maxUtilization, maxResponseTime):
+        c = max(1, min(int(c), self.numServers))
+        responseTime = self.getResponseTime(c)
+        if responseTime == maxint:
+            # Queues grow for the whole simulation -> jobs wait about half of it on average
+            responseTime = self.simTime / 2.0
+        maxTemp = self.getMaxTemp()
+        penalty = 0.0
+        # Huge penalties for infeasible solutions
+        if maxTemp > maxTemperature:
+            penalty += maxTemp
+        if self.jobUtil > maxUtilization:
+            penalty += self.jobUtil
+        if responseTime > maxResponseTime:
+            penalty += responseTime
+        # Servers that are on are above the average by (1 - c / numServers) of their value, the others are below it
+        spread = c * (1 - c / float(self.numServers))
+        penalty += spread * (maxTemp + self.getEnergy(c) + self.jobUtil + responseTime)
+        return numReps * penalty
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import sqlite3
+import time
+from io import BytesIO
+import numpy as np
+
+class ResultCache(object):
+
+    # Arrays stored for each entry, in the order of Simulator.getRepetitionResults
+    _ARRAYS = ('throughput', 'avgJobsInSystem', 'energy', 'utilization', 'maxTemp', 'responseTime')
+
+    """
+    __init__
+
+    Initialize a persistent cache of simulation results, stored in an SQLite database as compressed NumPy arrays.
+    Entries are keyed by a hash of the full set of simulation parameters, the seed and the model version (see
+    getModelVersion). Once the entries take more than maxBytes the least recently used ones are evicted.
+    Several processes can use the same cache file at once: each opens its own connection, and writes are serialized
+    by SQLite's locking.
+
+    @param path: path of the SQLite database
+    @param maxBytes: maximum total size of the stored results
+    @return: none
+    """
+    def __init__(self, path='simulation_cache.sqlite', maxBytes=512 * 1024 * 1024):
+        super(ResultCache, self).__init__()
+        self.path = path
+        self.maxBytes = maxBytes
+        self.modelVersion = getModelVersion()
+        self.connection = None
+        self.pid = None
+
+# Getters
+
+    """
+    getKey
+
+    @param parameters: dictionary of every parameter that determines the results, including the seed
+    @return: key of the entry for the parameters under the current model version
+    """
+    def getKey(self, parameters):
+        description = repr(sorted(parameters.items())) + self.modelVersion
+        return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+    """
+    get
+
+    Look up an entry, marking it as the most recently used.
+
+    @param key: key of the entry (see getKey)
+    @return: list containing the results of each repetition as given by Simulator.getRepetitionResults,
+             None if there is no entry for the key
+    """
+    def get(self, key):
+        connection = self.getConnection()
+        with connection:
+            row = connection.execute('SELECT data FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE results SET lastUsed = ? WHERE key = ?', (time.time(), key))
+        arrays = np.load(BytesIO(bytes(row[0])))
+        columns = [arrays[name].tolist() for name in ResultCache._ARRAYS]
+        return list(zip(*columns))
+
+# Functionality methods
+
+    """
+    put
+
+    Store the results of a simulation, then evict the least recently used entries until the cache fits in maxBytes.
+
+    @param key: key of the entry (see getKey)
+    @param results: SimulationResults of the simulation
+    @return: none
+    """
+    def put(self, key, results):
+        buffer = BytesIO()
+        np.savez_compressed(buffer, throughput=results.throughput, avgJobsInSystem=results.avgJobsInSystem,
+                            energy=results.energy, utilization=results.utilization, maxTemp=results.maxTemp,
+                            responseTime=results.responseTime)
+        data = buffer.getvalue()
+        connection = self.getConnection()
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO results (key, data, size, lastUsed) VALUES (?, ?, ?, ?)',
+                               (key, sqlite3.Binary(data), len(data), time.time()))
+            totalBytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            while totalBytes > self.maxBytes:
+                oldest = connection.execute('SELECT key, size FROM results ORDER BY lastUsed LIMIT 1').fetchone()
+                connection.execute('DELETE FROM results WHERE key = ?', (oldest[0],))
+                totalBytes -= oldest[1]
+
+    """
+    getConnection
+
+    Open the connection to the database for this process if it isn't open yet. Connections aren't shared with
+    forked worker processes, which open their own.
+
+    @return: the connection
+    """
+    def getConnection(self):
+        if self.connection is None or self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, timeout=60)
+            self.pid = os.getpid()
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            with self.connection:
+                self.connection.execute('CREATE TABLE IF NOT EXISTS results '
+                                        '(key TEXT PRIMARY KEY, data BLOB, size INTEGER, lastUsed REAL)')
+                self.connection.execute('CREATE INDEX IF NOT EXISTS resultsLastUsed ON results (lastUsed)')
+        return self.connection
+
+    """
+    __getstate__
+
+    Leave out the connection when the cache is pickled.
+
+    @return: dictionary of the state of the cache
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['connection'] = None
+        state['pid'] = None
+        return state
+
+# Modules whose code determines the results of a simulation -> a change to any of them invalidates the cache
+modelModules = ('Simulator.py', 'Server.py', 'Job.py', 'PowerModel.py', 'HeatModel.py', 'VariateSupplier.py',
+                'TraceSupplier.py', 'ServerPool.py', 'EventCalendar.py', 'IndexedHeap.py', 'ServerFarm.py',
+                'TimerWheel.py')
+
+"""
+getModelVersion
+
+@return: hash of the code of the modules that determine the results of a simulation
+"""
+def getModelVersion():
+    digest = hashlib.sha1()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in modelModules:
+        with open(os.path.join(directory, module), 'rb') as moduleFile:
+            digest.update(moduleFile.read())
+    return digest.hexdigest()
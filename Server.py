@@ -1,5 +1,6 @@
 from Job import Job
 from sys import maxint
+from collections import deque
 from PowerModel import PowerModel
 from HeatModel import HeatModel
 
@@ -15,31 +16,57 @@ class Server(object):
 
     Initialize a server based on input parameters and default values as necessary
 
+    By default the server only keeps running sums of the response times and utilizations of the jobs it finishes,
+    so its memory use doesn't grow with the length of the simulation. The finished jobs and utilization samples
+    can be kept as well when they are needed for further analysis.
+
+    @param keepHistory: True to keep every finished job and utilization sample in jobsFinished and utilizationHistory
+    @param jobLog: JobEventLog to record every finished job in -> None to not record them
+    @param index: index of the server within the simulator, used in the records of the jobLog
+    @param thermalTimeConstant: time constant of the server's temperature (see HeatModel) -> 0 for the temperature to
+                                follow the utilization instantly
+    @param keepOnWhenIdle: True for the server to stay on when its queue drains, for its power state to be managed by
+                           the simulator, False for it to shut down straight away
     @return: none
     """
-    def __init__(self):
+    def __init__(self, keepHistory=False, jobLog=None, index=0, thermalTimeConstant=0.0, keepOnWhenIdle=False):
         super(Server, self).__init__()
         # Queue used to track the job processing times
-        self.queue = []
-        # List used to track the jobs finished
+        self.queue = deque()
+        self.keepHistory = keepHistory
+        self.jobLog = jobLog
+        self.index = index
+        # List used to track the jobs finished -> only filled when keepHistory is set
         self.jobsFinished = []
-        # List used to track the utilization history of the server
+        # List used to track the utilization history of the server -> only filled when keepHistory is set
         self.utilizationHistory = []
+        # Running sums used for the averages
+        self.sumResponseTimes = 0
+        self.sumUtilization = 0
         # Instance ID
         self.serverID = Server._numInstances
         # Server status
         self.isBusy = False
         # Server on/off
         self.isTurnedOn = False
+        self.keepOnWhenIdle = keepOnWhenIdle
+        # Turning on -> the jobs queued wait until the setup is done
+        self.isSettingUp = False
+        # Power model of the power state while no job is processed -> None to draw nothing
+        self.standbyPowerModel = None
         self.util = 0.0
         self.energyConsumed = 0.0
         # Initialize the power model associated with the server
         self.powerModel = PowerModel()
         # Initialize the heat model associated with the server
-        self.heatModel = HeatModel()
+        self.heatModel = HeatModel(thermalTimeConstant)
+        # Temperature of the server as of lastUpdateTime, starting from the idle temperature
+        self.temp = self.heatModel.getCurrTemp(0.0)
         # Using the number of jobs as the moving average tracker for the utilization
         self.numJobsProcessed = 0
         self.maxTemp = 0.0
+        # Simulation time up to which the processing time, energy and temperature have been accounted for
+        self.lastUpdateTime = 0.0
         # Update the number of instances of the Server class
         Server._numInstances += 1
 
@@ -48,11 +75,11 @@ class Server(object):
     """
     getAvgUtilization
 
-    @return: the average utilization of the server based on the utilization history
+    @return: the average utilization of the server based on the utilization of every job processed
     """
     def getAvgUtilization(self):
         if self.numJobsProcessed > 0:
-            return round(sum(self.utilizationHistory) / self.numJobsProcessed, 2)
+            return round(self.sumUtilization / self.numJobsProcessed, 2)
         else:
             return 0.0
 
@@ -65,14 +92,8 @@ class Server(object):
     @return: average respones time of all completed jobs
     """
     def getAvgResponseTime(self):
-        if len(self.jobsFinished) > 0:
-            numJobsFinished = 0
-            sumTimes = 0
-            for job in self.jobsFinished:
-                if job.getIsFinished():
-                    sumTimes += job.getResponseTime()
-                    numJobsFinished += 1
-            return sumTimes / numJobsFinished
+        if self.numJobsProcessed > 0:
+            return self.sumResponseTimes / self.numJobsProcessed
         return 0
 
     """
@@ -141,6 +162,18 @@ class Server(object):
     def getMaxTemp(self):
         return round(self.maxTemp, 2)
 
+    """
+    getTemp
+
+    The server is first brought up to the given time.
+
+    @param currentTime: the current simulation time
+    @return: temperature of the server at the given time
+    """
+    def getTemp(self, currentTime):
+        self.updateToTime(currentTime)
+        return self.temp
+
 # Setter
     """
     setIsServerOn
@@ -152,42 +185,120 @@ class Server(object):
     def setIsServerOn(self, isOn):
         self.isTurnedOn = isOn
 
+    """
+    setPowerState
+
+    Set the power state of the server. The server is first brought up to the given time. When a setup ends the job at
+    the head of the queue starts being processed.
+
+    @param currentTime: the current simulation time
+    @param isOn: True if the server is on or turning on, False if it is asleep or off
+    @param standbyPowerModel: power model of the state while no job is processed -> None to draw nothing
+    @param isSettingUp: True if the server is turning on and can't process jobs yet
+    @return: none
+    """
+    def setPowerState(self, currentTime, isOn, standbyPowerModel, isSettingUp=False):
+        self.updateToTime(currentTime)
+        self.isTurnedOn = isOn
+        self.standbyPowerModel = standbyPowerModel
+        wasSettingUp = self.isSettingUp
+        self.isSettingUp = isSettingUp
+        if wasSettingUp and not isSettingUp and len(self.queue) > 0:
+            self.queue[0].setServiceStartTime(currentTime)
+            self.updateServerUtil()
+
 # Functionality methods
 
     """
     processNextDeparture
 
     Process the next departure from the queue of jobs as long as there as jobs within the queue.
-    Add the departing job to the list of jobs finished. Update the utilization history as well.
-    If the queue is empty after the job departs then the server will shut down.
+    The server is first brought up to the time of the departure.
+    Add the response time and utilization of the departing job to the running sums, and to the list of jobs finished
+    and the utilization history if they are being kept. Otherwise the job is released for reuse.
+    The departing job is recorded in the job log if there is one.
+    If the queue is empty after the job departs then the server will shut down, unless it is kept on when idle.
 
     @return: none
     """
     def processNextDeparture(self, endTime):
+        self.updateToTime(endTime)
         if (len(self.queue) > 0):
-            self.queue[0].setIsFinished(True)
-            self.queue[0].setEndTime(endTime)
-            self.jobsFinished.append(self.queue.pop(0))
-            self.utilizationHistory.append(self.util)
+            job = self.queue.popleft()
+            job.setIsFinished(True)
+            job.setEndTime(endTime)
+            self.sumResponseTimes += job.getResponseTime()
+            self.sumUtilization += self.util
+            if self.jobLog is not None:
+                self.jobLog.record(job.startTime, job.getServiceStartTime(), endTime, self.index, job.getMIPS())
+            if self.keepHistory:
+                self.jobsFinished.append(job)
+                self.utilizationHistory.append(self.util)
+            else:
+                # Nothing else holds on to the job, it can be reused by the next arrival
+                Job.release(job)
             self.numJobsProcessed += 1
-        if (len(self.queue) == 0):
+        if (len(self.queue) > 0):
+            # The next job starts being processed
+            self.queue[0].setServiceStartTime(endTime)
+            self.updateServerUtil()
+        else:
             # print 'Server ', self.serverID, ' turning off...'
             self.util = 0.0
             self.isBusy = False
-            self.isTurnedOn = False
+            if not self.keepOnWhenIdle:
+                self.isTurnedOn = False
 
     """
     addNewArrival
 
-    Adds a new job to the server's job queue. Sets the server status to being busy
+    Adds a new job to the server's job queue. Sets the server status to being busy.
+    The server is first brought up to the time of the arrival.
 
     @return: none
     """
     def addNewArrival(self, simTime, processingTime, mips):
+        self.updateToTime(simTime)
         if (processingTime > 0):
-            newJob = Job(simTime, processingTime, mips)
+            newJob = Job.acquire(simTime, processingTime, mips)
             self.queue.append(newJob)
             self.isBusy = True
+            # The job is processed straight away if the server was empty and is done setting up
+            if (len(self.queue) == 1 and not self.isSettingUp):
+                newJob.setServiceStartTime(simTime)
+                self.updateServerUtil()
+
+    """
+    resetStatistics
+
+    Discard the results gathered so far -> response times, utilizations, energy consumed and maximum temperature.
+    The server is first brought up to the given time, and its maximum temperature starts again from its temperature
+    then. The jobs in the queue and the power state of the server are kept.
+
+    @param currentTime: the current simulation time
+    @return: none
+    """
+    def resetStatistics(self, currentTime):
+        self.updateToTime(currentTime)
+        self.jobsFinished = []
+        self.utilizationHistory = []
+        self.sumResponseTimes = 0
+        self.sumUtilization = 0
+        self.numJobsProcessed = 0
+        self.energyConsumed = 0.0
+        self.maxTemp = self.temp
+
+    """
+    __getstate__
+
+    Leave out the job log when the server is pickled.
+
+    @return: dictionary of the state of the server
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['jobLog'] = None
+        return state
 
 # Update methods
     """
@@ -204,31 +315,54 @@ class Server(object):
     """
     updateMaxTemp
 
-    Updates the maximum temperature of the server if the current temperature exceeds
-    the previous maximum temperature
+    Brings the temperature of the server to the end of a period at the current utilization, and updates the maximum
+    temperature if the temperature exceeds the previous maximum temperature. The temperature moves steadily towards the
+    steady state of the utilization, so it is highest at one end of the period.
 
+    @param elapsedTime: duration of the period
     @return: none
     """
-    def updateMaxTemp(self):
-        currTemp = self.heatModel.getCurrTemp(self.util)
-        if (self.maxTemp < currTemp):
-            self.maxTemp = currTemp
+    def updateMaxTemp(self, elapsedTime):
+        self.temp = self.heatModel.getTempAfter(self.temp, self.util, elapsedTime)
+        if (self.maxTemp < self.temp):
+            self.maxTemp = self.temp
 
     """
     updateProcessingTimes
 
     Updates the processing time of the current job being worked on. Also calls to update
-    the utilization, temperature, and power consumption of the servers.
+    the utilization, temperature, and power consumption of the servers. A server that isn't processing a job cools
+    down and draws the power of its standby power model.
 
     @return: none
     """
     def updateProcessingTimes(self, elapsedTime):
-        if (len(self.queue) > 0):
+        if (len(self.queue) > 0 and not self.isSettingUp):
             updatedProcessingTime = self.queue[0].getProcessingTime() - elapsedTime
             self.queue[0].setProcessingTime(updatedProcessingTime)
             self.updateServerUtil()
-            self.updateMaxTemp()
+            self.updateMaxTemp(elapsedTime)
             self.energyConsumed += self.powerModel.getPowerConsumed(self.util, elapsedTime)
+        else:
+            self.temp = self.heatModel.getTempAfter(self.temp, 0.0, elapsedTime)
+            if self.standbyPowerModel is not None:
+                self.energyConsumed += self.standbyPowerModel.getPowerConsumed(0.0, elapsedTime)
+
+    """
+    updateToTime
+
+    Brings the server up to the given simulation time. The time elapsed since the server was last updated is
+    accounted for in one step, so servers only need to be updated when they are changed or their results are read
+    instead of at every event of the simulation.
+
+    @param currentTime: the current simulation time
+    @return: none
+    """
+    def updateToTime(self, currentTime):
+        elapsedTime = currentTime - self.lastUpdateTime
+        if (elapsedTime > 0):
+            self.updateProcessingTimes(elapsedTime)
+        self.lastUpdateTime = currentTime
 
 # UNUSED / DEPRACATED
 # def printServerState(self):
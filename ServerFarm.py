@@ -0,0 +1,437 @@
+from Job import Job
+from Server import Server
+from sys import maxint
+from collections import deque
+from PowerModel import PowerModel
+from HeatModel import HeatModel
+import numpy as np
+
+class ServerFarm(object):
+
+    """
+    __init__
+
+    Initialize a fleet of servers stored as a structure of arrays. Instead of a Server object per server with its own
+    PowerModel and HeatModel, the utilization, remaining processing time of the job being processed, energy consumed,
+    maximum temperature, power state and queue length of every server are kept in contiguous NumPy arrays, and a single
+    PowerModel and HeatModel are applied to whole arrays at once. The queues of jobs only exist for servers that have
+    jobs, so a large fleet that is mostly idle takes little memory.
+
+    A single server is changed through its index, or through the view given by farm[index] which has the same methods
+    as a Server. Bringing the whole fleet up to a time, resetting its statistics and reading its results are
+    vectorized over the servers. The results are identical to those of a list of Server objects.
+
+    @param numServers: number of servers within the farm
+    @param keepHistory: True to keep every finished job and utilization sample in jobsFinished and utilizationHistory
+    @param jobLog: JobEventLog to record every finished job in -> None to not record them
+    @param thermalTimeConstant: time constant of the servers' temperatures (see HeatModel) -> 0 for the temperatures to
+                                follow the utilizations instantly
+    @param keepOnWhenIdle: True for the servers to stay on when their queue drains, for their power states to be
+                           managed by the simulator, False for them to shut down straight away
+    @return: none
+    """
+    def __init__(self, numServers, keepHistory=False, jobLog=None, thermalTimeConstant=0.0, keepOnWhenIdle=False):
+        super(ServerFarm, self).__init__()
+        self.numServers = numServers
+        self.keepHistory = keepHistory
+        self.jobLog = jobLog
+        # Queues of jobs of the servers that have jobs, by index
+        self.queues = {}
+        # Jobs finished and utilization history of each server by index -> only filled when keepHistory is set
+        self.jobsFinished = {}
+        self.utilizationHistory = {}
+        self.isTurnedOn = np.zeros(numServers, dtype=bool)
+        self.keepOnWhenIdle = keepOnWhenIdle
+        # Turning on -> the jobs queued wait until the setup is done
+        self.isSettingUp = np.zeros(numServers, dtype=bool)
+        # Power drawn by each server while no job is processed, in watts
+        self.standbyPower = np.zeros(numServers)
+        self.queueLength = np.zeros(numServers, dtype=np.int64)
+        self.util = np.zeros(numServers)
+        # Remaining processing time of the job at the head of each queue
+        self.remaining = np.zeros(numServers)
+        self.energyConsumed = np.zeros(numServers)
+        self.maxTemp = np.zeros(numServers)
+        # Running sums used for the averages
+        self.sumResponseTimes = np.zeros(numServers)
+        self.sumUtilization = np.zeros(numServers)
+        self.numJobsProcessed = np.zeros(numServers, dtype=np.int64)
+        # Simulation time up to which each server has been accounted for
+        self.lastUpdateTime = np.zeros(numServers)
+        # Models shared by every server
+        self.powerModel = PowerModel()
+        self.heatModel = HeatModel(thermalTimeConstant)
+        # Temperature of each server as of its lastUpdateTime, starting from the idle temperature
+        self.temp = np.full(numServers, self.heatModel.getCurrTemp(0.0))
+
+# Getters
+
+    """
+    __getitem__
+
+    @param index: index of a server
+    @return: view of the server with the same methods as a Server
+    """
+    def __getitem__(self, index):
+        return FarmServer(self, index)
+
+    """
+    __len__
+
+    @return: number of servers within the farm
+    """
+    def __len__(self):
+        return self.numServers
+
+    """
+    getQueueLength
+
+    @param index: index of the server
+    @return: length of the job queue for the server
+    """
+    def getQueueLength(self, index):
+        return self.queueLength[index]
+
+    """
+    getNextDepartureTime
+
+    @param index: index of the server
+    @return: time of the next departure from the server based on the job queue
+    """
+    def getNextDepartureTime(self, index):
+        if self.queueLength[index] > 0:
+            return self.remaining[index]
+        return maxint
+
+    """
+    getNumServersOn
+
+    @return: number of servers that are turned on
+    """
+    def getNumServersOn(self):
+        return int(np.count_nonzero(self.isTurnedOn))
+
+    """
+    getAvgUtilizations
+
+    @return: list containing the average utilization of each server based on the utilization of every job processed
+             (see Server.getAvgUtilization)
+    """
+    def getAvgUtilizations(self):
+        averages = self.sumUtilization / np.maximum(self.numJobsProcessed, 1)
+        return [round(value, 2) for value in averages.tolist()]
+
+    """
+    getAvgResponseTimes
+
+    @return: list containing the average response time of the jobs completed by each server, 0 for the servers that
+             finished no jobs (see Server.getAvgResponseTime)
+    """
+    def getAvgResponseTimes(self):
+        averages = (self.sumResponseTimes / np.maximum(self.numJobsProcessed, 1)).tolist()
+        for index in np.flatnonzero(self.numJobsProcessed == 0).tolist():
+            averages[index] = 0
+        return averages
+
+    """
+    getTotalEnergyConsumptions
+
+    @return: list containing the energy consumed by each server up to the point of calling this method
+    """
+    def getTotalEnergyConsumptions(self):
+        return [round(value, 2) for value in self.energyConsumed.tolist()]
+
+    """
+    getMaxTemps
+
+    @return: list containing the maximum temperature reached by each server thus far
+    """
+    def getMaxTemps(self):
+        return [round(value, 2) for value in self.maxTemp.tolist()]
+
+    """
+    getTemp
+
+    The server is first brought up to the given time.
+
+    @param index: index of the server
+    @param currentTime: the current simulation time
+    @return: temperature of the server at the given time
+    """
+    def getTemp(self, index, currentTime):
+        self.updateServerToTime(index, currentTime)
+        return self.temp[index]
+
+# Functionality methods
+
+    """
+    processNextDeparture
+
+    Process the next departure from the queue of a server, the same way as Server.processNextDeparture.
+
+    @param index: index of the server
+    @param endTime: time of the departure
+    @return: none
+    """
+    def processNextDeparture(self, index, endTime):
+        self.updateServerToTime(index, endTime)
+        queue = self.queues.get(index)
+        if queue:
+            job = queue.popleft()
+            job.setIsFinished(True)
+            job.setEndTime(endTime)
+            self.sumResponseTimes[index] += job.getResponseTime()
+            self.sumUtilization[index] += self.util[index]
+            if self.jobLog is not None:
+                self.jobLog.record(job.startTime, job.getServiceStartTime(), endTime, index, job.getMIPS())
+            if self.keepHistory:
+                self.jobsFinished.setdefault(index, []).append(job)
+                self.utilizationHistory.setdefault(index, []).append(self.util[index])
+            else:
+                # Nothing else holds on to the job, it can be reused by the next arrival
+                Job.release(job)
+            self.numJobsProcessed[index] += 1
+            self.queueLength[index] -= 1
+        if queue:
+            # The next job starts being processed
+            queue[0].setServiceStartTime(endTime)
+            self.startNextJob(index, queue[0])
+        else:
+            self.queues.pop(index, None)
+            self.util[index] = 0.0
+            if not self.keepOnWhenIdle:
+                self.isTurnedOn[index] = False
+
+    """
+    addNewArrival
+
+    Add a new job to the queue of a server, the same way as Server.addNewArrival.
+
+    @param index: index of the server
+    @param simTime: time of the arrival
+    @param processingTime: processing time of the job
+    @param mips: MIPS requirement of the job
+    @return: none
+    """
+    def addNewArrival(self, index, simTime, processingTime, mips):
+        self.updateServerToTime(index, simTime)
+        if processingTime > 0:
+            newJob = Job.acquire(simTime, processingTime, mips)
+            queue = self.queues.get(index)
+            if queue is None:
+                queue = self.queues[index] = deque()
+            queue.append(newJob)
+            self.queueLength[index] += 1
+            # The job is processed straight away if the server was empty and is done setting up
+            if len(queue) == 1 and not self.isSettingUp[index]:
+                newJob.setServiceStartTime(simTime)
+                self.startNextJob(index, newJob)
+
+    """
+    setPowerState
+
+    Set the power state of a server, the same way as Server.setPowerState.
+
+    @param index: index of the server
+    @param currentTime: the current simulation time
+    @param isOn: True if the server is on or turning on, False if it is asleep or off
+    @param standbyPowerModel: power model of the state while no job is processed -> None to draw nothing
+    @param isSettingUp: True if the server is turning on and can't process jobs yet
+    @return: none
+    """
+    def setPowerState(self, index, currentTime, isOn, standbyPowerModel, isSettingUp=False):
+        self.updateServerToTime(index, currentTime)
+        self.isTurnedOn[index] = isOn
+        self.standbyPower[index] = standbyPowerModel.getPower(0.0) if standbyPowerModel is not None else 0.0
+        wasSettingUp = self.isSettingUp[index]
+        self.isSettingUp[index] = isSettingUp
+        if wasSettingUp and not isSettingUp and self.queueLength[index] > 0:
+            queue = self.queues[index]
+            queue[0].setServiceStartTime(currentTime)
+            self.startNextJob(index, queue[0])
+
+    """
+    resetStatistics
+
+    Discard the results gathered so far by every server. The servers are first brought up to the given time, and their
+    maximum temperatures start again from their temperatures then. The jobs in the queues and the power states are kept.
+
+    @param currentTime: the current simulation time
+    @return: none
+    """
+    def resetStatistics(self, currentTime):
+        self.updateToTime(currentTime)
+        self.jobsFinished = {}
+        self.utilizationHistory = {}
+        self.sumResponseTimes[:] = 0
+        self.sumUtilization[:] = 0
+        self.numJobsProcessed[:] = 0
+        self.energyConsumed[:] = 0
+        self.maxTemp[:] = self.temp
+
+    """
+    __getstate__
+
+    Leave out the job log when the farm is pickled.
+
+    @return: dictionary of the state of the farm
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['jobLog'] = None
+        return state
+
+# Update methods
+
+    """
+    startNextJob
+
+    Start processing the job now at the head of the queue of a server.
+
+    @param index: index of the server
+    @param job: the job at the head of the queue
+    @return: none
+    """
+    def startNextJob(self, index, job):
+        self.remaining[index] = job.getProcessingTime()
+        self.util[index] = job.getMIPS() / Server._processingPowerInMIPS
+
+    """
+    updateServerToTime
+
+    Bring a single server up to the given simulation time, the same way as Server.updateToTime.
+
+    @param index: index of the server
+    @param currentTime: the current simulation time
+    @return: none
+    """
+    def updateServerToTime(self, index, currentTime):
+        elapsedTime = currentTime - self.lastUpdateTime[index]
+        if elapsedTime > 0 and self.queueLength[index] > 0 and not self.isSettingUp[index]:
+            self.remaining[index] -= elapsedTime
+            util = self.util[index]
+            currTemp = self.temp[index] = self.heatModel.getTempAfter(self.temp[index], util, elapsedTime)
+            if self.maxTemp[index] < currTemp:
+                self.maxTemp[index] = currTemp
+            self.energyConsumed[index] += self.powerModel.getPowerConsumed(util, elapsedTime)
+        elif elapsedTime > 0:
+            self.temp[index] = self.heatModel.getTempAfter(self.temp[index], 0.0, elapsedTime)
+            if self.standbyPower[index] > 0:
+                self.energyConsumed[index] += elapsedTime * self.standbyPower[index]
+        self.lastUpdateTime[index] = currentTime
+
+    """
+    updateToTime
+
+    Bring every server up to the given simulation time at once. Servers that aren't processing a job cool down and
+    draw their standby power.
+
+    @param currentTime: the current simulation time
+    @return: none
+    """
+    def updateToTime(self, currentTime):
+        elapsedTimes = currentTime - self.lastUpdateTime
+        elapsed = elapsedTimes > 0
+        busy = elapsed & (self.queueLength > 0) & ~self.isSettingUp
+        standby = elapsed & ~busy
+        # The utilization of a server that isn't processing a job is 0
+        self.temp[elapsed] = self.heatModel.getTempAfter(self.temp[elapsed], self.util[elapsed], elapsedTimes[elapsed])
+        self.energyConsumed[standby] += elapsedTimes[standby] * self.standbyPower[standby]
+        elapsedTimes = elapsedTimes[busy]
+        utils = self.util[busy]
+        self.remaining[busy] -= elapsedTimes
+        self.maxTemp[busy] = np.maximum(self.maxTemp[busy], self.temp[busy])
+        self.energyConsumed[busy] += self.powerModel.getPowerConsumed(utils, elapsedTimes)
+        self.lastUpdateTime[:] = currentTime
+
+class FarmServer(object):
+    # Fixed set of attributes -> views are created for every access to a server of the farm
+    __slots__ = ('farm', 'index')
+
+    """
+    __init__
+
+    Initialize a view of a single server of a ServerFarm with the methods of a Server used by the simulator.
+
+    @param farm: the farm the server belongs to
+    @param index: index of the server within the farm
+    @return: none
+    """
+    def __init__(self, farm, index):
+        self.farm = farm
+        self.index = index
+
+    """
+    util
+
+    @return: the instantaneous utilization of the server
+    """
+    @property
+    def util(self):
+        return self.farm.util[self.index]
+
+    """
+    getQueueLength
+
+    @return: length of the job queue for the server
+    """
+    def getQueueLength(self):
+        return self.farm.queueLength[self.index]
+
+    """
+    getNextDepartureTime
+
+    @return: time of the next departure from the server based on the job queue
+    """
+    def getNextDepartureTime(self):
+        return self.farm.getNextDepartureTime(self.index)
+
+    """
+    getIsServerOn
+
+    @return: boolean server on or off
+    """
+    def getIsServerOn(self):
+        return self.farm.isTurnedOn[self.index]
+
+    """
+    setIsServerOn
+
+    @param isOn: True if want server to be on False if want server to be off
+    @return: none
+    """
+    def setIsServerOn(self, isOn):
+        self.farm.isTurnedOn[self.index] = isOn
+
+    """
+    isSettingUp
+
+    @return: True if the server is turning on and can't process jobs yet
+    """
+    @property
+    def isSettingUp(self):
+        return self.farm.isSettingUp[self.index]
+
+    """
+    setPowerState
+
+    @return: none (see ServerFarm.setPowerState)
+    """
+    def setPowerState(self, currentTime, isOn, standbyPowerModel, isSettingUp=False):
+        self.farm.setPowerState(self.index, currentTime, isOn, standbyPowerModel, isSettingUp)
+
+    """
+    addNewArrival
+
+    @return: none (see ServerFarm.addNewArrival)
+    """
+    def addNewArrival(self, simTime, processingTime, mips):
+        self.farm.addNewArrival(self.index, simTime, processingTime, mips)
+
+    """
+    processNextDeparture
+
+    @return: none (see ServerFarm.processNextDeparture)
+    """
+    def processNextDeparture(self, endTime):
+        self.farm.processNextDeparture(self.index, endTime)
@@ -0,0 +1,78 @@
+from IndexedHeap import IndexedHeap
+
+class ServerPool(object):
+
+    """
+    __init__
+
+    Initialize the server pool used by the DNS routing policy. The pool keeps two indexed structures so that a
+    routing decision doesn't require scanning the servers:
+
+    -> available: servers that are on and below the utilization threshold, keyed by their queue length
+    -> off: servers that are off, keyed by their index so the lowest index is turned on first
+
+    A server's entries must be refreshed (see updateServer) whenever its queue, utilization or power state changes.
+    Every operation costs O(log numServers).
+
+    @param numServers: number of servers within the pool
+    @param upperBoundUtil: utilization at or above which a server is taken out of consideration
+    @return: none
+    """
+    def __init__(self, numServers, upperBoundUtil):
+        super(ServerPool, self).__init__()
+        self.upperBoundUtil = upperBoundUtil
+        self.available = IndexedHeap(numServers)
+        self.off = IndexedHeap(numServers)
+
+# Getters
+
+    """
+    getShortestQueue
+
+    @return: index of the available server with the shortest queue, ties going to the lowest index.
+             None if no server is available
+    """
+    def getShortestQueue(self):
+        return self.available.peek()
+
+    """
+    getFirstOffServer
+
+    @return: lowest index of a server that is turned off, None if every server is on
+    """
+    def getFirstOffServer(self):
+        return self.off.peek()
+
+# Functionality methods
+
+    """
+    updateServer
+
+    Move a server into the structures matching its current state.
+
+    @param index: index of the server
+    @param server: the server object
+    @return: none
+    """
+    def updateServer(self, index, server):
+        if server.getIsServerOn():
+            self.off.remove(index)
+            if server.util < self.upperBoundUtil:
+                self.available.update(index, server.getQueueLength())
+            else:
+                self.available.remove(index)
+        else:
+            self.available.remove(index)
+            if not self.off.contains(index):
+                self.off.update(index, index)
+
+    """
+    clear
+
+    Remove every server from the pool.
+
+    @return: none
+    """
+    def clear(self):
+        self.available.clear()
+        self.off.clear()
@@ -0,0 +1,76 @@
+import numpy as np
+
+class SimulationResults(object):
+
+    """
+    __init__
+
+    Initialize the results of the repetitions of a simulation as NumPy arrays: one value per repetition for the
+    throughput and average number of jobs in the system, and a (reps x servers) array for each per-server result.
+
+    @param throughput: list containing the throughput for each repetition
+    @param avgJobsInSystem: list containing the average number of jobs within the simulation for each repetition
+    @param energy: list containing the power consumption of each server for each repetition
+    @param utilization: list containing the average utilization of each server for each repetition
+    @param maxTemp: list containing the maximum temperature of each server for each repetition
+    @param responseTime: list containing the average response time of each server for each repetition
+    @return: none
+    """
+    def __init__(self, throughput, avgJobsInSystem, energy, utilization, maxTemp, responseTime):
+        super(SimulationResults, self).__init__()
+        self.throughput = np.array(throughput, dtype=np.float64)
+        self.avgJobsInSystem = np.array(avgJobsInSystem, dtype=np.float64)
+        numServers = len(energy[0]) if len(energy) > 0 else 0
+        shape = (len(energy), numServers)
+        self.energy = np.array(energy, dtype=np.float64).reshape(shape)
+        self.utilization = np.array(utilization, dtype=np.float64).reshape(shape)
+        self.maxTemp = np.array(maxTemp, dtype=np.float64).reshape(shape)
+        self.responseTime = np.array(responseTime, dtype=np.float64).reshape(shape)
+
+# Getters
+
+    """
+    getNumReps
+
+    @return: number of repetitions in the results
+    """
+    def getNumReps(self):
+        return self.energy.shape[0]
+
+    """
+    getNumServers
+
+    @return: number of servers in the results
+    """
+    def getNumServers(self):
+        return self.energy.shape[1]
+
+# Functionality methods
+
+    """
+    getPenalty
+
+    Calculate the penalty score of the results. For every repetition:
+
+    -> Huge penalties for infeasible solutions: the maximum over the servers of the maximum temperature, utilization
+       and response time is added if it exceeds the given limit
+    -> Every server is penalized by how far its maximum temperature, energy, utilization and response time
+       are above the average over the servers
+
+    @param maxTemperature: highest acceptable maximum temperature of a server
+    @param maxUtilization: highest acceptable average utilization of a server
+    @param maxResponseTime: highest acceptable average response time of a server
+    @return: the total penalty score over every repetition
+    """
+    def getPenalty(self, maxTemperature, maxUtilization, maxResponseTime):
+        if self.getNumReps() == 0 or self.getNumServers() == 0:
+            return 0
+        totalPenalty = 0.0
+        for values, limit in ((self.maxTemp, maxTemperature), (self.utilization, maxUtilization),
+                              (self.responseTime, maxResponseTime)):
+            maxForReps = values.max(axis=1)
+            totalPenalty += maxForReps[maxForReps > limit].sum()
+        for values in (self.maxTemp, self.energy, self.utilization, self.responseTime):
+            aboveAverage = values - values.mean(axis=1)[:, np.newaxis]
+            totalPenalty += aboveAverage[aboveAverage > 0].sum()
+        return float(totalPenalty)
@@ -1,11 +1,34 @@
 # Import statements
 from Server import Server
-from sys import maxint
-from math import log, ceil
-from random import random, uniform, seed, randint
+from ServerFarm import ServerFarm
+from EventCalendar import EventCalendar
+from ServerPool import ServerPool
+from PowerModel import PowerModel
+from TimerWheel import TimerWheel
+from VariateSupplier import VariateSupplier
+from TraceSupplier import TraceSupplier
+from SimulationResults import SimulationResults
+from random import SystemRandom
+from multiprocessing import Pool
+from math import sqrt
+from scipy.stats import t
+from timeit import default_timer
+import cPickle as pickle
+import zlib
+import os
 
 class Simulator(object):
 
+    # Class variable -> Methods making up each phase of the simulation that is profiled
+    _profiledPhases = {'routing': ['getIndexUsingShortestQueueWithDNSandRR'],
+                       'departureSearch': ['getServerWithNextDeparture'],
+                       'serverUpdates': ['assignJobToServer', 'processDeparture', 'updateServerTimes'],
+                       'variates': ['generateNextArrival', 'generateNextProcessingTime', 'generateNextJobMIPS',
+                                    'getRandomServer'],
+                       'powerStates': ['fireNextTimer']}
+    # Class variable -> Power state of a server that is turning on
+    _SETUP_STATE = -1
+
     """
     __init__
 
@@ -19,10 +42,52 @@ class Simulator(object):
     @param numReps: number of repetitions the simulator will run for
     @param jobMaxMIPS: the maximum number of millions of instructions per second (MIPS) that a job can reach
     @param toTurnOn: the aggressivness parameter determines the number of servers that are initially turned on within the simulator
+    @param keepHistory: True to have the servers keep every finished job and utilization sample, False to only keep the
+                        running sums needed for the results
+    @param seed: non-negative integer seed for the random variates -> a random seed is chosen if unspecified.
+                 Runs with the same seed and parameters give identical results, and runs with the same seed see the same
+                 arrivals, processing times and MIPS in each repetition whatever the number of servers turned on
+    @param variateBlockSize: number of random variates drawn at once for each stream
+    @param numWorkers: number of worker processes the repetitions are run on -> 1 runs them in this process
+    @param relativePrecision: target confidence interval half-width relative to the mean -> None to only run numReps
+                              repetitions
+    @param maxReps: maximum number of repetitions when running to a relativePrecision
+    @param precisionMetrics: metrics that have to reach the relativePrecision, any of 'throughput', 'avgJobsInSystem',
+                             'power', 'utilization', 'maxTemp' and 'responseTime' (see getRepetitionMetric)
+    @param confidence: confidence level of the confidence intervals
+    @param recorder: TimeSeriesRecorder to record the average number of jobs in the system over time with
+                     -> None to not record it
+    @param tracePath: path of a .npy job trace to replay instead of generating jobs (see TraceSupplier)
+                      -> None to generate jobs from lamb, mu and jobMaxMIPS
+    @param jobLog: JobEventLog to record every finished job in -> None to not record them
+    @param profile: True to count the calls and time spent in each phase of the simulation (see getProfile)
+    @param upperBoundUtil: utilization at or above which the routing policy takes a server out of consideration
+    @param resultCache: ResultCache to look the results up in and store them in when a seed is specified
+                        -> None to always simulate
+    @param serverFarm: True to keep the servers in the NumPy arrays of a ServerFarm instead of Server objects, which
+                       takes far less memory for large fleets and vectorizes the updates and results over the servers.
+                       The results are identical either way
+    @param thermalTimeConstant: time constant of the servers' temperatures, which lag behind their utilization
+                                (see HeatModel) -> 0 for the temperatures to follow the utilization instantly
+    @param setupDelay: time a server that is off takes to turn on, drawing its peak power, before it starts processing
+                       the jobs routed to it
+    @param idleTimeout: time a server stays on and idle, drawing its idle power, once its queue drains before it goes
+                        to sleep or off
+    @param sleepStates: sequence of the (power, wakeDelay, timeout) of the sleep states a server goes through one after
+                        the other once the idleTimeout is over: the power it draws in watts, the time it takes to turn
+                        back on, and the time before it goes on to the next state (None to stay in it). The server
+                        turns off after the last state.
+                        With no setupDelay, idleTimeout or sleepStates servers turn on and off instantly
+    @param timerResolution: length of a tick of the timer wheel the power state transitions are scheduled on
 
     @return: none
     """
-    def __init__(self, lamb, mu, numServers, simTime, numReps, jobMaxMIPS, toTurnOn):
+    def __init__(self, lamb, mu, numServers, simTime, numReps, jobMaxMIPS, toTurnOn, keepHistory=False, seed=None,
+                 variateBlockSize=4096, numWorkers=1, relativePrecision=None, maxReps=100,
+                 precisionMetrics=('throughput', 'avgJobsInSystem'), confidence=0.95, recorder=None,
+                 tracePath=None, jobLog=None, profile=False,
+                 upperBoundUtil=0.9, resultCache=None, serverFarm=False,
+                 thermalTimeConstant=0.0, setupDelay=0.0, idleTimeout=0.0, sleepStates=(), timerResolution=0.01):
         super(Simulator, self).__init__()
 
         # Inistialize instance variables from arguments
@@ -33,9 +98,44 @@ class Simulator(object):
         self.simTime = simTime
         self.numRepetitions = numReps
         self.numServersToTurnOn = toTurnOn
-
-        # Fill an array with numServers Server objects
-        self.servers = [Server() for i in range(0, numServers)]
+        self.keepHistory = keepHistory
+        # Only runs with a specified seed can be repeated, so only those are cached
+        self.resultCache = resultCache if seed is not None else None
+        if seed is None:
+            seed = SystemRandom().randint(0, 2**32 - 1)
+        self.seed = seed
+        self.variateBlockSize = variateBlockSize
+        self.tracePath = tracePath
+        self.jobLog = jobLog
+        # Per repetition calls and time of each phase -> only kept when profiling
+        self.profile = []
+        self.isProfiling = profile
+        self.numWorkers = numWorkers
+        self.relativePrecision = relativePrecision
+        self.maxReps = maxReps
+        self.precisionMetrics = precisionMetrics
+        self.confidence = confidence
+        # Threshold for utilization before taking the server out of consideration by the routing policy
+        self.upperBoundUtil = upperBoundUtil
+        self.serverFarm = serverFarm
+        self.thermalTimeConstant = thermalTimeConstant
+        self.setupDelay = setupDelay
+        self.idleTimeout = idleTimeout
+        self.sleepStates = tuple(tuple(state) for state in sleepStates)
+        self.timerResolution = timerResolution
+        # Power states servers go through once idle -> None if servers turn on and off instantly
+        self.powerStates = self.createPowerStates()
+        # A server turning on draws its peak power
+        self.setupPowerModel = PowerModel(PowerModel().getPower(1.0), 0)
+
+        # Fill an array with numServers Server objects, or a ServerFarm
+        self.servers = self.createServers()
+        # Calendar holding the absolute time of the next departure of each busy server
+        self.calendar = EventCalendar(numServers)
+        # Pool tracking which servers are on, off and below the utilization threshold for the routing policy
+        self.pool = ServerPool(numServers, self.upperBoundUtil)
+        # Supplier of the random variates for the current repetition
+        self.variates = self.createVariateSupplier(0)
 
         # Initialize to default values
         self.timeToNextArrival = 0
@@ -44,6 +144,7 @@ class Simulator(object):
         self.numArrivals = 0
         self.numDepartures = 0
         self.numJobsInSystem = 0
+        self.resetPowerStates()
 
         # Declare arrays to hold data that will be used for analysis by the penaltyFunction
         # This can become its own structure later ?
@@ -54,47 +155,114 @@ class Simulator(object):
         self.maxTempTracker = []
         self.avgResponseTimes = []
 
-        # For plotting results -- DEPRACATED
-        self.avgJobsTracker = []
-        self.timeTracker = []
+        # Optional recorder of the average number of jobs in the system over time, for plotting results
+        self.recorder = recorder
 
         # Debug logger
         # print '--- Init ----'
         # print 'Turning on ', self.numServersToTurnOn, ' servers...'
         # print '--- **** ----'
         # Turn on self.numServersToTurnOn servers <- declared above
-        for server in self.servers:
-            if self.servers.index(server) < self.numServersToTurnOn:
-                server.setIsServerOn(True)
-        # Once the necessary number of servers has been turned on, theres no point in continuing the loop
-            else:
-                break
+        self.turnOnInitialServers()
+        if profile:
+            self.enableProfiling()
+
+    """
+    turnOnInitialServers
+
+    Turn on the first numServersToTurnOn servers and place every server in the routing pool.
+
+    @return: none
+    """
+    def turnOnInitialServers(self):
+        self.pool.clear()
+        for index in range(0, self.numServers):
+            if index < self.numServersToTurnOn:
+                self.turnOnIdleServer(index)
+            self.pool.updateServer(index, self.servers[index])
+
+    """
+    createPowerStates
+
+    @return: list of the (standby power model, wake-up delay, timeout) of each power state a server goes through once
+             its queue drains: on and idle, then each of the sleepStates, then off.
+             None if servers turn on and off instantly
+    """
+    def createPowerStates(self):
+        if self.setupDelay <= 0 and self.idleTimeout <= 0 and not self.sleepStates:
+            return None
+        powerStates = [(PowerModel(), 0.0, self.idleTimeout)]
+        for power, wakeDelay, timeout in self.sleepStates:
+            powerStates.append((PowerModel(power, 0), wakeDelay, timeout))
+        powerStates.append((None, self.setupDelay, None))
+        return powerStates
+
+    """
+    resetPowerStates
+
+    Start every server off with no power state transition scheduled.
+
+    @return: none
+    """
+    def resetPowerStates(self):
+        if self.powerStates is None:
+            self.timers = None
+            self.serverPowerStates = None
+        else:
+            self.timers = TimerWheel(self.timerResolution)
+            self.serverPowerStates = [len(self.powerStates) - 1] * self.numServers
 
     """
     resetVariablesForNewRepetition
 
     Reset the the necessary variables for a new repetition of the simulation.
     All of the variables being reset are those with default values in the initializer.
-    New servers are also created and turned on as necessary
+    New servers are also created and turned on as necessary, and the random variates are drawn from the streams
+    of the given repetition.
 
+    @param simNumber: index of the repetition about to be run
     @return: none
     """
-    def resetVariablesForNewRepetition(self):
+    def resetVariablesForNewRepetition(self, simNumber):
         # Initialize to default values
-        self.servers = [Server() for i in range(0, self.numServers)]
+        self.servers = self.createServers()
+        if self.jobLog is not None:
+            self.jobLog.setRepetition(simNumber)
+        self.calendar.clear()
+        self.variates = self.createVariateSupplier(simNumber)
         self.timeToNextArrival = 0
         self.timeToNextDeparture = 0
         self.numJobsInSystem = 0
         self.currentTime = 0
         self.numArrivals = 0
         self.numDepartures = 0
+        self.resetPowerStates()
         # Turn on self.numServersToTurnOn servers
-        for server in self.servers:
-            if self.servers.index(server) < self.numServersToTurnOn:
-                server.setIsServerOn(True)
-        # Once the necessary number of servers has been turned on, theres no point in continuing the loop
-            else:
-                break
+        self.turnOnInitialServers()
+
+    """
+    createServers
+
+    @return: new servers for a repetition -> a ServerFarm if serverFarm is set, a list of Server objects otherwise
+    """
+    def createServers(self):
+        keepOnWhenIdle = self.powerStates is not None
+        if self.serverFarm:
+            return ServerFarm(self.numServers, self.keepHistory, self.jobLog, self.thermalTimeConstant, keepOnWhenIdle)
+        return [Server(self.keepHistory, self.jobLog, i, self.thermalTimeConstant, keepOnWhenIdle)
+                for i in range(0, self.numServers)]
+
+    """
+    createVariateSupplier
+
+    @param simNumber: index of the repetition
+    @return: supplier of the jobs of the repetition -> replaying the trace if there is one, random otherwise
+    """
+    def createVariateSupplier(self, simNumber):
+        if self.tracePath is not None:
+            return TraceSupplier(self.tracePath, self.numServers, self.seed, simNumber)
+        return VariateSupplier(self.lamb, self.mu, self.numServers, self.maxMIPS, self.seed, simNumber,
+                               self.variateBlockSize)
 
     """
     getPowerConsumptions
@@ -145,6 +313,66 @@ class Simulator(object):
     def getAvgResponseTime(self):
         return self.avgResponseTimes
 
+    """
+    getProfile
+
+    @return: list containing, for each repetition profiled, a dictionary of the phases of the simulation ('routing',
+             'departureSearch', 'serverUpdates', 'variates' and 'powerStates') to their number of calls and cumulative
+             time in seconds. The serverUpdates are the handling of every arrival and departure by its server, which
+             brings the server up to the current time, and bringing every server up to time before results are read
+    """
+    def getProfile(self):
+        return [dict((phase, {'calls': counts[0], 'time': counts[1]}) for phase, counts in repProfile.items())
+                for repProfile in self.profile]
+
+    """
+    getResults
+
+    @return: SimulationResults holding the results of every repetition as NumPy arrays
+    """
+    def getResults(self):
+        return SimulationResults(self.throughput, self.avgNumJobsInSystem, self.powerConsumedByServers,
+                                 self.avgServerUtilizations, self.maxTempTracker, self.avgResponseTimes)
+
+    """
+    getNumRepetitionsRun
+
+    @return: number of repetitions that have been run
+    """
+    def getNumRepetitionsRun(self):
+        return len(self.throughput)
+
+    """
+    getRepetitionMetric
+
+    @param metric: one of 'throughput', 'avgJobsInSystem', or 'power', 'utilization', 'maxTemp' and 'responseTime'
+                   which are averaged over the servers
+    @return: list containing the value of the metric for each repetition
+    """
+    def getRepetitionMetric(self, metric):
+        if metric == 'throughput':
+            return self.throughput
+        if metric == 'avgJobsInSystem':
+            return self.avgNumJobsInSystem
+        perServer = {'power': self.powerConsumedByServers, 'utilization': self.avgServerUtilizations,
+                     'maxTemp': self.maxTempTracker, 'responseTime': self.avgResponseTimes}[metric]
+        return [sum(rep) / float(len(rep)) for rep in perServer]
+
+    """
+    setUpperBoundUtil
+
+    Set the utilization at or above which the routing policy takes a server out of consideration, and move the
+    servers into the routing pool entries matching it.
+
+    @param upperBoundUtil: the utilization threshold
+    @return: none
+    """
+    def setUpperBoundUtil(self, upperBoundUtil):
+        self.upperBoundUtil = upperBoundUtil
+        self.pool.upperBoundUtil = upperBoundUtil
+        for index in range(0, self.numServers):
+            self.pool.updateServer(index, self.servers[index])
+
     """
     addNewJobToServers
 
@@ -159,48 +387,197 @@ class Simulator(object):
         jobMIPS = self.generateNextJobMIPS()
         # Change decision making policy here
         indexOfServerToAssign = self.getIndexUsingShortestQueueWithDNSandRR()
-        self.servers[indexOfServerToAssign].addNewArrival(self.currentTime, processingTime, jobMIPS)
+        self.assignJobToServer(indexOfServerToAssign, processingTime, jobMIPS)
 
     """
-    generateNextJobMIPS
+    assignJobToServer
 
-    Generate a random MIPS requirement for a job that is to be assigned. MIPS is generated from the desired utilization,
-    but is allowed to "wiggle" within an acceptable margin; i.e. if the desired utilization is 0.7 then the MIPS can vary
-    between 0.7-0.7*wiggle to 0.7+0.7*wiggle utilization. The utilization ultimately evens out within a few percent of the desired utilization.
-    The wiggle can be adjusted to lessen or increase the range.
+    Add a new job to the queue of the server at the given index. If the job is at the head of the queue
+    (i.e. the server was empty) and the server isn't turning on its departure is entered into the calendar. The
+    server's place in the routing pool is updated to match its new queue length and utilization. A server waiting to
+    go to sleep has its timer cancelled, and a server that is asleep or off is woken up.
 
-    Checks are in place to ensure that no utilization below 0 or above 1 can occur relative to the maxMIPS
+    @param index: index of the server to assign the job to
+    @param processingTime: processing time of the job
+    @param jobMIPS: MIPS requirement of the job
 
-    @return: the MIPS requirement for a job
+    @return: none
     """
-    def generateNextJobMIPS(self):
-        # Setpoint is generated from Utilization = (Lambda / (Mu*numServers))
-        setpoint = self.maxMIPS*(self.lamb / self.numServers)
-        wiggle = 0.40
-        lower = setpoint - wiggle * setpoint
-        upper = setpoint + wiggle * setpoint
-        currMIPS = uniform(lower, upper)
-        # Checks in place to ensure jobs generated can't drive servers past 100% utilization or below 0% utilization
-        if currMIPS / self.maxMIPS > 1.0:
-            return self.maxMIPS
-        # This seems like a stupid check, but if the lowerbound is somehow negative and the generator returns a value less than 0
-        # as a result, this check will catch it.
-        elif currMIPS / self.maxMIPS < 0.0:
-            return 0.0
-        return currMIPS
+    def assignJobToServer(self, index, processingTime, jobMIPS):
+        server = self.servers[index]
+        if self.timers is not None:
+            if self.serverPowerStates[index] == 0:
+                self.timers.cancel(index)
+            elif self.serverPowerStates[index] != Simulator._SETUP_STATE:
+                self.wakeServer(index)
+        wasEmpty = server.getQueueLength() == 0
+        server.addNewArrival(self.currentTime, processingTime, jobMIPS)
+        if wasEmpty and server.getQueueLength() > 0 and not server.isSettingUp:
+            self.calendar.scheduleDeparture(index, self.currentTime + server.getNextDepartureTime())
+        self.pool.updateServer(index, server)
+
+    """
+    processDeparture
+
+    Process the departure of the job at the head of a server's queue at the current time, and update the server's
+    calendar entry.
+
+    @param index: index of the server
+    @return: none
+    """
+    def processDeparture(self, index):
+        self.servers[index].processNextDeparture(self.currentTime)
+        self.scheduleNextDeparture(index)
+
+    """
+    scheduleNextDeparture
+
+    Update the calendar entry of a server after a departure. The job now at the head of the queue is scheduled,
+    or the entry is removed if the queue is empty, in which case the server starts going through its power states.
+    The server's place in the routing pool is updated as well since the departure may have turned it off.
+
+    @param index: index of the server
+    @return: none
+    """
+    def scheduleNextDeparture(self, index):
+        server = self.servers[index]
+        if server.getQueueLength() > 0:
+            self.calendar.scheduleDeparture(index, self.currentTime + server.getNextDepartureTime())
+        else:
+            self.calendar.cancelDeparture(index)
+            if self.timers is not None:
+                self.enterPowerState(index, 0)
+        self.pool.updateServer(index, server)
+
+    """
+    turnOnIdleServer
+
+    Turn a server on instantly. If power states are managed it goes through them from on and idle like any server whose
+    queue drains, so with no idleTimeout it moves straight on to the next state.
+
+    @param index: index of the server
+    @return: none
+    """
+    def turnOnIdleServer(self, index):
+        if self.timers is None:
+            self.servers[index].setIsServerOn(True)
+            return
+        self.enterPowerState(index, 0)
+
+    """
+    turnOffIdleServer
+
+    Turn an idle server off instantly. If power states are managed it goes straight to the off state.
+
+    @param index: index of the server
+    @return: none
+    """
+    def turnOffIdleServer(self, index):
+        if self.timers is None:
+            self.servers[index].setIsServerOn(False)
+            return
+        self.enterPowerState(index, len(self.powerStates) - 1)
+
+    """
+    setServerOn
 
+    Put a server in the on power state with no transition scheduled, ending its setup if it was turning on.
+
+    @param index: index of the server
+    @return: none
+    """
+    def setServerOn(self, index):
+        self.servers[index].setPowerState(self.currentTime, True, self.powerStates[0][0])
+        self.serverPowerStates[index] = 0
+        self.timers.cancel(index)
+
+    """
+    wakeServer
+
+    Turn on a server that is asleep or off. It is on straight away if its power state has no wake-up delay, otherwise
+    it sets up for that long first. Either way it counts as on for the routing policy, so jobs queue on it meanwhile.
+
+    @param index: index of the server
+    @return: none
     """
-    generateRandomTime
+    def wakeServer(self, index):
+        if self.timers is None:
+            self.servers[index].setIsServerOn(True)
+            return
+        wakeDelay = self.powerStates[self.serverPowerStates[index]][1]
+        if wakeDelay > 0:
+            self.servers[index].setPowerState(self.currentTime, True, self.setupPowerModel, True)
+            self.serverPowerStates[index] = Simulator._SETUP_STATE
+            self.timers.arm(index, self.currentTime + wakeDelay)
+        else:
+            self.setServerOn(index)
 
-    Generates a uniform random value based on the input parameter
+    """
+    enterPowerState
 
-    @param param: Either lambda or mu depending on the use. Lambda used to generate a job arrival time,
-                  mu used to generate a job processing time.
+    Put an idle server in one of its power states and schedule its move to the next one. A state with a timeout of 0 is
+    passed straight through.
 
-    @return: a random time
+    @param index: index of the server
+    @param state: index of the state within powerStates
+    @return: none
     """
-    def generateRandomTime(self, param):
-        return -1.0 * log(random()) / (float)(param)
+    def enterPowerState(self, index, state):
+        standbyPowerModel, wakeDelay, timeout = self.powerStates[state]
+        self.servers[index].setPowerState(self.currentTime, state == 0, standbyPowerModel)
+        self.serverPowerStates[index] = state
+        if timeout is None:
+            self.timers.cancel(index)
+        elif timeout > 0:
+            self.timers.arm(index, self.currentTime + timeout)
+        else:
+            self.enterPowerState(index, state + 1)
+
+    """
+    fireNextTimer
+
+    Carry out the earliest power state transition due before the next arrival or departure, if there is one, and no
+    later than endTime. A server done setting up starts processing its jobs, and an idle server moves on to its next
+    power state.
+
+    @param endTime: simulation time the repetition runs until
+    @return: True if a transition was carried out, False otherwise
+    """
+    def fireNextTimer(self, endTime):
+        nextEventTime = min(endTime, self.currentTime + self.timeToNextArrival)
+        if self.numJobsInSystem > 0:
+            nextEventTime = min(nextEventTime, self.calendar.getNextDepartureTime())
+        timer = self.timers.popNext(nextEventTime)
+        if timer is None:
+            return False
+        index, expiry = timer
+        elapsedTime = expiry - self.currentTime
+        if elapsedTime > 0:
+            self.updateAverageNumJobsInSystem(self.repIndex, self.currentTime - self.statsStartTime, elapsedTime)
+            self.currentTime = expiry
+            self.timeToNextArrival -= elapsedTime
+        server = self.servers[index]
+        if self.serverPowerStates[index] == Simulator._SETUP_STATE:
+            self.setServerOn(index)
+            if server.getQueueLength() > 0:
+                self.calendar.scheduleDeparture(index, self.currentTime + server.getNextDepartureTime())
+            else:
+                self.enterPowerState(index, 0)
+        else:
+            self.enterPowerState(index, self.serverPowerStates[index] + 1)
+        self.pool.updateServer(index, server)
+        return True
+
+    """
+    generateNextJobMIPS
+
+    Generate a random MIPS requirement for a job that is to be assigned, uniform within a margin around the desired
+    utilization and clipped to between 0 and maxMIPS (see VariateSupplier.nextJobMIPS).
+
+    @return: the MIPS requirement for a job
+    """
+    def generateNextJobMIPS(self):
+        return self.variates.nextJobMIPS()
 
     """
     generateNextArrival
@@ -210,7 +587,7 @@ class Simulator(object):
     @return: arrival time for another job
     """
     def generateNextArrival(self):
-        return self.generateRandomTime(self.lamb)
+        return self.variates.nextArrival()
 
     """
     generateNextProcessingTime
@@ -220,7 +597,7 @@ class Simulator(object):
     @return: processing time for a job
     """
     def generateNextProcessingTime(self):
-        return self.generateRandomTime(self.mu)
+        return self.variates.nextProcessingTime()
 
     """
     getRandomServer
@@ -230,7 +607,7 @@ class Simulator(object):
     @return: index of a random server
     """
     def getRandomServer(self):
-        return (randint(0,100)) % len(self.servers)
+        return self.variates.nextRandomServer()
 
     """
     getIndexUsingShortestQueueWithDNSandRR
@@ -247,41 +624,35 @@ class Simulator(object):
     (4) -> If no servers can be turned on since they're all already being used and are on
           -> Assign the job randomly
 
+    The servers meeting (a) and (b) are kept in the routing pool ordered by queue length, and the servers that are
+    off are ordered by index, so each step costs O(log numServers) instead of a scan of the servers.
+    Ties in queue length go to the lowest index and step (3) turns on exactly one server, the lowest index that is off.
+
     @return: index of a server based on the aforementioned rules
     """
     def getIndexUsingShortestQueueWithDNSandRR(self):
-        serverChosen = None
-        # Threshold for utilization before taking the server out of consideration
-        # This could become an instance variable later on...
-        upperBoundUtil = 0.9
-        # Scan all servers -> Can be made more efficient by keeping track of servers by their utilization and status
-        for server in self.servers:
-            # Check for (1)
-            if server.getIsServerOn() and server.util < upperBoundUtil:
-                # Step (2)
-                tempLength = maxint if serverChosen is None else serverChosen.getQueueLength()
-                if server.getQueueLength() < tempLength:
-                    serverChosen = server
-                    # Uncomment to see which servers are being selected while they're still on and why
-                    # print 'Server ', server.getServerID(), ' is', server.getIsServerOn(), 'and has util ', server.getInstantUtil()
+        # Check for (1) and step (2)
+        indexChosen = self.pool.getShortestQueue()
+        # Uncomment to see which servers are being selected while they're still on and why
+        # print 'Server ', indexChosen, ' has queue length ', self.servers[indexChosen].getQueueLength()
         # If a server has not been assigned that means that (a) and (b) where not met.
         # Now at step (3)
-        if serverChosen is None:
-            for server in self.servers:
-                if not server.getIsServerOn():
-                    # Uncomment to see which servers are being turned on
-                    # print 'Turning on server ', server.getServerID()
-                    server.setIsServerOn(True)
-                    serverChosen = server
+        if indexChosen is None:
+            indexChosen = self.pool.getFirstOffServer()
+            if indexChosen is not None:
+                # Uncomment to see which servers are being turned on
+                # print 'Turning on server ', indexChosen
+                self.wakeServer(indexChosen)
+                self.pool.updateServer(indexChosen, self.servers[indexChosen])
         # Check if the job still hasn't been assigned
         # Resort to random routing
         # Now at step (4)
-        if serverChosen is None:
+        if indexChosen is None:
             # Uncomment to see if the router has to resort to being random due to overutilization
             # If this is happening at anything less than ~95% utilization there's an issue.
             # print 'Had to resort to random routing... '
             return self.getRandomServer()
-        return self.servers.index(serverChosen)
+        return indexChosen
 
     """
     allocatedWithDynamicShutdowns
@@ -291,33 +662,68 @@ class Simulator(object):
     @return: none
     """
     def allocatedWithDynamicShutdowns(self, processingTime, processingMIPS):
-        self.servers[self.getIndexUsingShortestQueueWithDNSandRR()].addNewArrival(self.currentTime, processingTime, processingMIPS)
+        self.assignJobToServer(self.getIndexUsingShortestQueueWithDNSandRR(), processingTime, processingMIPS)
 
     """
     getServerWithNextDeparture
 
-    Scan the servers and find the server with the next departure time. Can optimize this by keeping track of the servers during
-    scans in previous function.
+    Find the server with the next departure time using the departure calendar. Ties go to the lowest index,
+    the same server a sequential scan of the servers would find.
 
     @return: index of server with the earliest departure time
     """
     def getServerWithNextDeparture(self):
-        nextDeparture = self.servers[0]
-        for server in self.servers:
-            if (server.getNextDepartureTime() < nextDeparture.getNextDepartureTime()):
-                nextDeparture = server
-        return self.servers.index(nextDeparture)
+        index = self.calendar.getServerWithNextDeparture()
+        # No departures are scheduled, every server is equally far from a departure
+        if index is None:
+            return 0
+        return index
 
     """
     updateServerTimes
 
-    Update the times for all servers. The remaining processing times will be updated for jobs being worked on for each server.
+    Bring all servers up to the current time. The remaining processing times, energy consumed and maximum temperatures
+    are accounted for lazily by the servers whenever they receive an arrival or a departure, so this only needs to be
+    called before the results of the servers are read.
 
     @return: none
     """
-    def updateServerTimes(self, elapsedTime):
+    def updateServerTimes(self):
+        if self.serverFarm:
+            self.servers.updateToTime(self.currentTime)
+            return
         for server in self.servers:
-            server.updateProcessingTimes(elapsedTime)
+            server.updateToTime(self.currentTime)
+
+    """
+    enableProfiling
+
+    Count the calls and time spent in each phase of the simulation. The methods of each phase are replaced on this
+    instance by timed versions, so a simulator that isn't profiling runs the plain methods at no extra cost.
+
+    @return: none
+    """
+    def enableProfiling(self):
+        for phase, methodNames in Simulator._profiledPhases.items():
+            for methodName in methodNames:
+                setattr(self, methodName, self.timePhase(phase, getattr(self, methodName)))
+
+    """
+    timePhase
+
+    @param phase: name of the phase the method belongs to
+    @param method: bound method to time
+    @return: function calling the method and adding the call and its time to the profile of the current repetition
+    """
+    def timePhase(self, phase, method):
+        def timedMethod(*args):
+            startTime = default_timer()
+            value = method(*args)
+            counts = self.profile[-1][phase]
+            counts[0] += 1
+            counts[1] += default_timer() - startTime
+            return value
+        return timedMethod
 
     """
     updateAverageNumJobsInSystem
@@ -335,6 +741,132 @@ class Simulator(object):
     Runs the simulation based on the parameters passed in to the initializer.
 
     The method will run numRepetitions repetitions of the simulation each lasting simTime in duration.
+    With a relativePrecision it then keeps adding repetitions until the confidence interval half-width of each of the
+    precisionMetrics is within relativePrecision of its mean, or maxReps repetitions have been run. The number of
+    repetitions used is given by getNumRepetitionsRun.
+
+    The repetitions share nothing with each other, so with numWorkers above 1 they are farmed out to a pool of worker
+    processes and their results merged back in repetition order. Every repetition draws its variates from the streams
+    of its own index, so the results are identical for any number of workers. With a relativePrecision the workers run
+    batches of repetitions, but the stopping rule is still checked after each repetition in order and the results past
+    the first repetition meeting it are discarded, so the number of repetitions doesn't depend on the workers either.
+    The servers of the repetitions run by workers are not kept, and only repetitions run in this process are recorded
+    by the recorder and the jobLog and profiled.
+
+    If there is a resultCache the results are looked up in it first, and the simulation is skipped entirely on a hit;
+    nothing is recorded, logged or profiled then. Otherwise the results are stored in it once the simulation is done.
+
+    @return: none
+    """
+    def runSimulation(self):
+        if self.resultCache is not None:
+            key = self.resultCache.getKey(self.getCacheParameters())
+            cached = self.resultCache.get(key)
+            if cached is not None:
+                for results in cached:
+                    self.addRepetitionResults(results)
+                return
+        self.runRepetitions(range(0, self.numRepetitions))
+        if self.relativePrecision is not None:
+            numReps = self.numRepetitions
+            while not self.isPrecise(numReps) and numReps < self.maxReps:
+                numRun = self.getNumRepetitionsRun()
+                if numReps == numRun:
+                    # Add as many repetitions as there are workers to run them
+                    numToAdd = min(max(1, self.numWorkers), self.maxReps - numRun)
+                    self.runRepetitions(range(numRun, numRun + numToAdd))
+                numReps += 1
+            self.discardRepetitions(numReps)
+        if self.resultCache is not None:
+            self.resultCache.put(key, self.getResults())
+
+    """
+    runRepetitions
+
+    Runs the given repetitions of the simulation, on the pool of worker processes if there is more than one worker.
+
+    @param simNumbers: indices of the repetitions to run
+    @return: none
+    """
+    def runRepetitions(self, simNumbers):
+        if self.numWorkers > 1 and len(simNumbers) > 1:
+            pool = Pool(min(self.numWorkers, len(simNumbers)))
+            try:
+                args = [(self.getParameters(), simNumber) for simNumber in simNumbers]
+                allResults = pool.map(runRepetitionInWorker, args)
+            finally:
+                pool.close()
+                pool.join()
+            for results in allResults:
+                self.addRepetitionResults(results)
+        else:
+            for simNumber in simNumbers:
+                self.runRepetition(simNumber)
+
+    """
+    isPrecise
+
+    Check whether the confidence interval half-width of every one of the precisionMetrics is within relativePrecision
+    of its mean. At least two repetitions are needed to estimate a half-width.
+
+    @param numReps: number of repetitions, from the first, to check -> None for every repetition run
+    @return: True if the target precision has been reached, False otherwise
+    """
+    def isPrecise(self, numReps=None):
+        if numReps is None:
+            numReps = self.getNumRepetitionsRun()
+        if numReps < 2:
+            return False
+        quantile = t.ppf((1 + self.confidence) / 2.0, numReps - 1)
+        for metric in self.precisionMetrics:
+            values = self.getRepetitionMetric(metric)[:numReps]
+            mean = sum(values) / float(numReps)
+            variance = sum((value - mean)**2 for value in values) / (numReps - 1)
+            halfWidth = quantile * sqrt(variance / numReps)
+            if halfWidth > self.relativePrecision * abs(mean):
+                return False
+        return True
+
+    """
+    runRepetition
+
+    Runs a single repetition of the simulation lasting simTime in duration.
+
+    @param simNumber: index of the repetition, determines the variate streams used
+    @return: the results of the repetition as given by getRepetitionResults
+    """
+    def runRepetition(self, simNumber):
+        self.startRepetition(simNumber)
+        self.runUntil(self.simTime)
+        return self.finishRepetition()
+
+    """
+    startRepetition
+
+    Set the simulator up for a new repetition starting from an empty system at time 0.
+
+    @param simNumber: index of the repetition, determines the variate streams used
+    @return: none
+    """
+    def startRepetition(self, simNumber):
+        # print 'Iteration: ', simNumber+1
+        # Ensure the variables that need to be reset are indeed reset, including the variate streams for the rep
+        self.resetVariablesForNewRepetition(simNumber)
+        self.simNumber = simNumber
+        # Position of the repetition within the result lists
+        self.repIndex = len(self.avgNumJobsInSystem)
+        # Time from which the results of the repetition are measured
+        self.statsStartTime = 0
+        if self.isProfiling:
+            self.profile.append(dict((phase, [0, 0.0]) for phase in Simulator._profiledPhases))
+        # Can't have a departure yet nothing's happened. Arrival has to occur
+        self.timeToNextArrival = self.generateNextArrival()
+        self.avgNumJobsInSystem.append(0)
+
+    """
+    runUntil
+
+    Runs the current repetition until the simulation time reaches endTime.
 
     How it works:
 
@@ -344,72 +876,86 @@ class Simulator(object):
             -> Assign the job
         -> If departure is sooner
             -> Handle the departure
-        -> Update times
-    -> At the end of repetition store all results for processing
+        -> Only the servers receiving the arrival or departure are updated
+    -> Once a trace has run out (the next arrival is infinitely far) the jobs left drain, then the repetition idles
+       until endTime
 
+    @param endTime: simulation time to run until
     @return: none
     """
-    def runSimulation(self):
-        # Run the simution for numRepetitions reps
-        for simNumber in range(0, self.numRepetitions):
-            # print 'Iteration: ', simNumber+1
-            # Sets a new seed for the iteration
-            seed()
-            # Ensure the variables that need to be reset are indeed reset
-            self.resetVariablesForNewRepetition()
-            # Can't have a departure yet nothing's happened. Arrival has to occur
-            self.timeToNextArrival = self.generateNextArrival()
-            self.avgNumJobsInSystem.append(0)
-            # Outer loop for the simTime
-            while (self.currentTime < self.simTime):
-                # Base case of 0 jobs being in the system so far
-                if (self.numJobsInSystem == 0):
-                    self.updateAverageNumJobsInSystem(simNumber, self.currentTime, self.timeToNextArrival)
-                    # Update time for arrival to occur
+    def runUntil(self, endTime):
+        repIndex = self.repIndex
+        # Outer loop for the simTime
+        while (self.currentTime < endTime):
+            # Power state transitions due before the next arrival or departure happen first
+            if self.timers is not None and self.fireNextTimer(endTime):
+                continue
+            # Base case of 0 jobs being in the system so far
+            if (self.numJobsInSystem == 0):
+                if self.timeToNextArrival == float('inf'):
+                    # No more jobs will arrive -> nothing happens until the end of the repetition
+                    self.updateAverageNumJobsInSystem(repIndex, self.currentTime - self.statsStartTime, endTime - self.currentTime)
+                    self.currentTime = endTime
+                    break
+                self.updateAverageNumJobsInSystem(repIndex, self.currentTime - self.statsStartTime, self.timeToNextArrival)
+                # Update time for arrival to occur
+                self.currentTime += self.timeToNextArrival
+                self.numArrivals += 1
+                # Add first job to random server
+                self.assignJobToServer(self.getRandomServer(), self.generateNextProcessingTime(), self.generateNextJobMIPS())
+                self.numJobsInSystem += 1
+                # Next arrival time generated
+                self.timeToNextArrival = self.generateNextArrival()
+            # Base case has passed, now checking for departure vs arrival times
+            else:
+                serverWithNextDeparture = self.getServerWithNextDeparture()
+                self.timeToNextDeparture = self.calendar.getDepartureTime(serverWithNextDeparture) - self.currentTime
+                if (self.timeToNextArrival < self.timeToNextDeparture):
+                    # Arrival Occurs
+                    self.updateAverageNumJobsInSystem(repIndex, self.currentTime - self.statsStartTime, self.timeToNextArrival)
+                    # Update sim time
                     self.currentTime += self.timeToNextArrival
                     self.numArrivals += 1
-                    # Add first job to random server
-                    self.servers[self.getRandomServer()].addNewArrival(self.currentTime, self.generateNextProcessingTime(), self.generateNextJobMIPS())
+                    # Assign the job
+                    self.allocatedWithDynamicShutdowns(self.generateNextProcessingTime(), self.generateNextJobMIPS())
                     self.numJobsInSystem += 1
                     # Next arrival time generated
                     self.timeToNextArrival = self.generateNextArrival()
-                # Base case has passed, now checking for departure vs arrival times
                 else:
-                    serverWithNextDeparture = self.getServerWithNextDeparture()
-                    self.timeToNextDeparture = self.servers[serverWithNextDeparture].getNextDepartureTime()
-                    if (self.timeToNextArrival < self.timeToNextDeparture):
-                        # Arrival Occurs
-                        self.updateAverageNumJobsInSystem(simNumber, self.currentTime, self.timeToNextArrival)
-                        # Update sim time
-                        self.currentTime += self.timeToNextArrival
-                        # Update server times
-                        self.updateServerTimes(self.timeToNextArrival)
-                        self.numArrivals += 1
-                        # Assign the job
-                        self.allocatedWithDynamicShutdowns(self.generateNextProcessingTime(), self.generateNextJobMIPS())
-                        self.numJobsInSystem += 1
-                        # Next arrival time generated
-                        self.timeToNextArrival = self.generateNextArrival()
-                    else:
-                        # Departure Occurs
-                        self.updateAverageNumJobsInSystem(simNumber, self.currentTime, self.timeToNextDeparture)
-                        # Update sim time
-                        self.currentTime += self.timeToNextDeparture
-                        self.timeToNextArrival -= self.timeToNextDeparture
-                        self.numDepartures += 1
-                        self.numJobsInSystem -= 1
-                        # Update server times
-                        self.updateServerTimes(self.timeToNextDeparture)
-                        # Handle departure of the job on the appropriate server
-                        self.servers[serverWithNextDeparture].processNextDeparture(self.currentTime)
-                self.avgJobsTracker.append(self.avgNumJobsInSystem[simNumber])
-                self.timeTracker.append(self.currentTime)
-            # ENDWHILE
-            # Add all values to lists to be passed back to wrapper for processing
-            throughputForRepetition = self.numDepartures / (float)(self.currentTime)
-            self.throughput.append(throughputForRepetition)
-            # Each list contains the server information for a single repetition.
-            # Each of these lists is then appended to the simulator's instance list
+                    # Departure Occurs
+                    self.updateAverageNumJobsInSystem(repIndex, self.currentTime - self.statsStartTime, self.timeToNextDeparture)
+                    # Update sim time
+                    self.currentTime += self.timeToNextDeparture
+                    self.timeToNextArrival -= self.timeToNextDeparture
+                    self.numDepartures += 1
+                    self.numJobsInSystem -= 1
+                    # Handle departure of the job on the appropriate server
+                    self.processDeparture(serverWithNextDeparture)
+            if self.recorder is not None:
+                self.recorder.record(self.simNumber, self.currentTime, self.avgNumJobsInSystem[repIndex])
+        # ENDWHILE
+
+    """
+    finishRepetition
+
+    End the current repetition and store all of its results for processing.
+
+    @return: the results of the repetition as given by getRepetitionResults
+    """
+    def finishRepetition(self):
+        # Bring every server up to the end of the repetition before reading their results
+        self.updateServerTimes()
+        # Add all values to lists to be passed back to wrapper for processing
+        throughputForRepetition = self.numDepartures / (float)(self.currentTime - self.statsStartTime)
+        self.throughput.append(throughputForRepetition)
+        # Each list contains the server information for a single repetition.
+        # Each of these lists is then appended to the simulator's instance list
+        if self.serverFarm:
+            powerConsumptions = self.servers.getTotalEnergyConsumptions()
+            serverUtilizations = self.servers.getAvgUtilizations()
+            maxTemps = self.servers.getMaxTemps()
+            responseTimes = self.servers.getAvgResponseTimes()
+        else:
             powerConsumptions = []
             serverUtilizations = []
             maxTemps = []
@@ -419,20 +965,226 @@ class Simulator(object):
                 powerConsumptions.append(server.getTotalEnergyConsumption())
                 maxTemps.append(server.getMaxTemp())
                 responseTimes.append(server.getAvgResponseTime())
-            self.powerConsumedByServers.append(powerConsumptions)
-            self.avgServerUtilizations.append(serverUtilizations)
-            self.maxTempTracker.append(maxTemps)
-            self.avgResponseTimes.append(responseTimes)
-            # ENDFOR
-        # ENDFOR
+        self.powerConsumedByServers.append(powerConsumptions)
+        self.avgServerUtilizations.append(serverUtilizations)
+        self.maxTempTracker.append(maxTemps)
+        self.avgResponseTimes.append(responseTimes)
+        return self.getRepetitionResults(self.repIndex)
+
+    """
+    warmUp
+
+    Start a repetition and run it for warmupTime, so that its state can be checkpointed (see checkpoint) and
+    continued from by several forks (see continueRepetition) instead of each of them paying for the warm-up.
+
+    @param simNumber: index of the repetition, determines the variate streams used
+    @param warmupTime: simulation time to run the warm-up for
+    @return: none
+    """
+    def warmUp(self, simNumber, warmupTime):
+        self.startRepetition(simNumber)
+        self.runUntil(warmupTime)
+
+    """
+    continueRepetition
+
+    Continue a warmed up repetition. Servers are turned on, or idle servers turned off from the highest index down,
+    until toTurnOn servers are on. Servers busy at the fork are never turned off, so more than toTurnOn servers can be
+    on until they drain. The results gathered during the warm-up are then discarded, and the repetition is run for
+    simTime more before its results are stored.
+
+    @param toTurnOn: number of servers that must be on when the repetition continues -> None to leave them as they are
+    @return: the results of the repetition as given by getRepetitionResults
+    """
+    def continueRepetition(self, toTurnOn=None):
+        if toTurnOn is not None:
+            self.numServersToTurnOn = toTurnOn
+            if self.serverFarm:
+                numOn = self.servers.getNumServersOn()
+            else:
+                numOn = sum(1 for server in self.servers if server.getIsServerOn())
+            while numOn < toTurnOn:
+                index = self.pool.getFirstOffServer()
+                if index is None:
+                    break
+                self.turnOnIdleServer(index)
+                self.pool.updateServer(index, self.servers[index])
+                numOn += 1
+            for index in range(self.numServers - 1, -1, -1):
+                if numOn <= toTurnOn:
+                    break
+                server = self.servers[index]
+                if server.getIsServerOn() and server.getQueueLength() == 0:
+                    self.turnOffIdleServer(index)
+                    self.pool.updateServer(index, server)
+                    numOn -= 1
+        self.resetStatistics()
+        self.runUntil(self.currentTime + self.simTime)
+        return self.finishRepetition()
+
+    """
+    resetStatistics
+
+    Discard the results gathered so far in the current repetition, which are then measured from the current time on.
+    The state of the system (jobs, servers, clock and random streams) is kept, and the maximum temperature of every
+    server starts from its current temperature.
+
+    @return: none
+    """
+    def resetStatistics(self):
+        if self.serverFarm:
+            self.servers.resetStatistics(self.currentTime)
+        else:
+            for server in self.servers:
+                server.resetStatistics(self.currentTime)
+        self.statsStartTime = self.currentTime
+        self.avgNumJobsInSystem[self.repIndex] = 0
+        self.numArrivals = 0
+        self.numDepartures = 0
+
+    """
+    checkpoint
+
+    Serialize the complete state of the simulator (servers, queues, random streams, clock and results) to a compressed
+    string. The recorder and the jobLog aren't part of the checkpoint.
+
+    @return: compressed pickle of the simulator
+    """
+    def checkpoint(self):
+        return zlib.compress(pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+
+    """
+    fromCheckpoint
+
+    Create a simulator from a checkpoint. Every simulator created from the same checkpoint continues independently
+    from the same state.
+
+    @param data: compressed pickle of a simulator as given by checkpoint
+    @param recorder: TimeSeriesRecorder for the new simulator -> None to not record
+    @param jobLog: JobEventLog for the new simulator -> None to not record the finished jobs
+    @return: the simulator
+    """
+    @staticmethod
+    def fromCheckpoint(data, recorder=None, jobLog=None):
+        mySim = pickle.loads(zlib.decompress(data))
+        mySim.recorder = recorder
+        mySim.jobLog = jobLog
+        if mySim.serverFarm:
+            mySim.servers.jobLog = jobLog
+        else:
+            for server in mySim.servers:
+                server.jobLog = jobLog
+        if mySim.isProfiling:
+            mySim.enableProfiling()
+        return mySim
+
+    """
+    __getstate__
+
+    Leave out the recorder, the jobLog and the profiling wrappers when the simulator is pickled.
+
+    @return: dictionary of the state of the simulator
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['recorder'] = None
+        state['jobLog'] = None
+        for methodNames in Simulator._profiledPhases.values():
+            for methodName in methodNames:
+                state.pop(methodName, None)
+        return state
+
+    """
+    getRepetitionResults
+
+    @param repIndex: position of the repetition within the result lists
+    @return: tuple of the throughput, average number of jobs in the system, and the lists of power consumptions,
+             average utilizations, maximum temperatures and average response times of the servers for the repetition
+    """
+    def getRepetitionResults(self, repIndex):
+        return (self.throughput[repIndex], self.avgNumJobsInSystem[repIndex], self.powerConsumedByServers[repIndex],
+                self.avgServerUtilizations[repIndex], self.maxTempTracker[repIndex], self.avgResponseTimes[repIndex])
+
+    """
+    addRepetitionResults
+
+    Append the results of a repetition run elsewhere (i.e. by a worker process) to the result lists.
+
+    @param results: tuple of results as given by getRepetitionResults
+    @return: none
+    """
+    def addRepetitionResults(self, results):
+        self.throughput.append(results[0])
+        self.avgNumJobsInSystem.append(results[1])
+        self.powerConsumedByServers.append(results[2])
+        self.avgServerUtilizations.append(results[3])
+        self.maxTempTracker.append(results[4])
+        self.avgResponseTimes.append(results[5])
+
+    """
+    discardRepetitions
+
+    Drop the results of every repetition past the first numReps.
+
+    @param numReps: number of repetitions to keep
+    @return: none
+    """
+    def discardRepetitions(self, numReps):
+        del self.throughput[numReps:]
+        del self.avgNumJobsInSystem[numReps:]
+        del self.powerConsumedByServers[numReps:]
+        del self.avgServerUtilizations[numReps:]
+        del self.maxTempTracker[numReps:]
+        del self.avgResponseTimes[numReps:]
+
+    """
+    getParameters
+
+    @return: dictionary of the keyword arguments needed to create a simulator with the same parameters as this one,
+             running a single repetition
+    """
+    def getParameters(self):
+        return {'lamb': self.lamb, 'mu': self.mu, 'numServers': self.numServers, 'simTime': self.simTime, 'numReps': 1,
+                'jobMaxMIPS': self.maxMIPS, 'toTurnOn': self.numServersToTurnOn, 'keepHistory': self.keepHistory,
+                'seed': self.seed, 'variateBlockSize': self.variateBlockSize, 'tracePath': self.tracePath,
+                'upperBoundUtil': self.upperBoundUtil, 'serverFarm': self.serverFarm,
+                'thermalTimeConstant': self.thermalTimeConstant, 'setupDelay': self.setupDelay,
+                'idleTimeout': self.idleTimeout, 'sleepStates': self.sleepStates, 'timerResolution': self.timerResolution}
+
+    """
+    getCacheParameters
+
+    @return: dictionary of every parameter that determines the results of runSimulation, including the seed
+    """
+    def getCacheParameters(self):
+        parameters = self.getParameters()
+        # Both representations of the servers give the same results
+        del parameters['serverFarm']
+        parameters['numReps'] = self.numRepetitions
+        parameters['relativePrecision'] = self.relativePrecision
+        if self.relativePrecision is not None:
+            parameters['maxReps'] = self.maxReps
+            parameters['precisionMetrics'] = tuple(self.precisionMetrics)
+            parameters['confidence'] = self.confidence
+        if self.tracePath is not None:
+            # A trace that has been rewritten gives different results
+            traceStat = os.stat(self.tracePath)
+            parameters['traceFile'] = (traceStat.st_size, traceStat.st_mtime)
+        return parameters
+
+"""
+runRepetitionInWorker
+
+Run a single repetition of the simulation within a worker process.
+
+@param args: tuple of the simulator keyword arguments (see Simulator.getParameters) and the index of the repetition
+@return: the results of the repetition as given by Simulator.getRepetitionResults
+"""
+def runRepetitionInWorker(args):
+    parameters, simNumber = args
+    return Simulator(**parameters).runRepetition(simNumber)
 
 # UNUSED / LEGACY
-# def getXAxis(self):
-#     return self.timeTracker
-#
-# def getYAxis(self):
-#     return self.avgJobsTracker
-#
 # def printState(self):
 #     print '-------------------------------------------------------'
 #     print 'TTNA\t', self.timeToNextArrival
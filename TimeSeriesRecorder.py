@@ -0,0 +1,137 @@
+import numpy as np
+
+class TimeSeriesRecorder(object):
+
+    # Columns of the recorded samples
+    _REPETITION = 0
+    _TIME = 1
+    _VALUE = 2
+
+    """
+    __init__
+
+    Initialize a recorder for a time series of the simulation, i.e. the average number of jobs in the system for plotting.
+    Samples are taken every eventStride events and/or at least timeStride time units apart, and kept in a fixed
+    buffer of capacity samples so the memory used doesn't grow with the length of the simulation. When the buffer is
+    full it either:
+
+    -> ring: overwrites the oldest samples, keeping the latest capacity samples
+    -> downsample: drops every other sample and doubles the strides, keeping samples over the whole simulation
+
+    @param capacity: maximum number of samples kept
+    @param timeStride: minimum simulation time between samples -> None for no time stride
+    @param eventStride: number of events between samples -> every event if neither stride is specified
+    @param mode: 'ring' or 'downsample'
+    @return: none
+    """
+    def __init__(self, capacity=10000, timeStride=None, eventStride=None, mode='downsample'):
+        super(TimeSeriesRecorder, self).__init__()
+        if mode not in ('ring', 'downsample'):
+            raise ValueError("mode must be 'ring' or 'downsample'")
+        if timeStride is None and eventStride is None:
+            eventStride = 1
+        self.capacity = capacity
+        self.timeStride = timeStride
+        self.eventStride = eventStride
+        self.mode = mode
+        # Sample buffer -> one row of (repetition, time, value) per sample
+        self.samples = np.zeros((capacity, 3))
+        self.numSamples = 0
+        # Position of the oldest sample once the ring buffer has wrapped around
+        self.start = 0
+        self.numEvents = 0
+        self.nextSampleTime = 0.0
+        self.lastRepetition = None
+
+# Getters
+
+    """
+    getSamples
+
+    @return: array with one row of (repetition, time, value) per sample kept, oldest first
+    """
+    def getSamples(self):
+        if self.start == 0:
+            return self.samples[:self.numSamples].copy()
+        return np.concatenate((self.samples[self.start:], self.samples[:self.start]))
+
+    """
+    getXAxis
+
+    @return: array of the times of the samples kept
+    """
+    def getXAxis(self):
+        return self.getSamples()[:, TimeSeriesRecorder._TIME]
+
+    """
+    getYAxis
+
+    @return: array of the values of the samples kept
+    """
+    def getYAxis(self):
+        return self.getSamples()[:, TimeSeriesRecorder._VALUE]
+
+# Functionality methods
+
+    """
+    record
+
+    Offer the value at an event of the simulation to the recorder, which keeps it if it falls on the strides.
+    The time stride starts over at the start of every repetition.
+
+    @param repetition: index of the repetition
+    @param time: current simulation time
+    @param value: value of the time series at that time
+    @return: none
+    """
+    def record(self, repetition, time, value):
+        if repetition != self.lastRepetition:
+            self.lastRepetition = repetition
+            self.nextSampleTime = 0.0
+        self.numEvents += 1
+        if self.eventStride is not None and self.numEvents % self.eventStride != 0:
+            return
+        if self.timeStride is not None:
+            if time < self.nextSampleTime:
+                return
+            self.nextSampleTime = time + self.timeStride
+        if self.numSamples == self.capacity:
+            if self.mode == 'ring':
+                self.samples[self.start] = (repetition, time, value)
+                self.start = (self.start + 1) % self.capacity
+                return
+            self.downsample()
+        self.samples[self.numSamples] = (repetition, time, value)
+        self.numSamples += 1
+
+    """
+    downsample
+
+    Halve the samples kept by dropping every other one, and double the strides to match.
+
+    @return: none
+    """
+    def downsample(self):
+        kept = self.samples[0:self.numSamples:2].copy()
+        self.numSamples = len(kept)
+        self.samples[:self.numSamples] = kept
+        if self.eventStride is not None:
+            self.eventStride *= 2
+        if self.timeStride is not None:
+            self.timeStride *= 2
+
+    """
+    flush
+
+    Write the samples kept to a memory-mapped .npy file, which can be read back lazily with
+    numpy.load(path, mmap_mode='r') for plotting.
+
+    @param path: path of the .npy file
+    @return: the memory-mapped array of samples
+    """
+    def flush(self, path):
+        samples = self.getSamples()
+        mapped = np.lib.format.open_memmap(path, mode='w+', dtype=samples.dtype, shape=samples.shape)
+        mapped[:] = samples
+        mapped.flush()
+        return mapped
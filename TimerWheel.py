@@ -0,0 +1,233 @@
+from heapq import heappush, heappop
+from sys import maxint
+
+class TimerWheel(object):
+
+    """
+    __init__
+
+    Initialize a hierarchical timer wheel holding at most one timer per key (i.e. per server). Time is divided into
+    ticks of the given resolution. Level l of the wheel has slotsPerLevel slots each covering slotsPerLevel**l ticks,
+    and a timer is placed in the lowest level whose span reaches its expiry. As the wheel turns the slots of the
+    higher levels are cascaded down into the lower ones, and the timers expiring within the current tick are moved to a
+    small heap so that they still fire in the exact order of their expiry times. Timers beyond the span of the top
+    level wait in an overflow bucket until it reaches them. Stretches of time with no timers in the lower levels are
+    skipped over without visiting their slots.
+
+    Arming and cancelling a timer cost O(1), and every timer is moved at most numLevels times before it fires.
+
+    @param resolution: length of a tick in simulation time units
+    @param slotsPerLevel: number of slots in each level of the wheel
+    @param numLevels: number of levels of the wheel
+    @return: none
+    """
+    def __init__(self, resolution=0.01, slotsPerLevel=64, numLevels=4):
+        super(TimerWheel, self).__init__()
+        self.resolution = resolution
+        self.slotsPerLevel = slotsPerLevel
+        self.numLevels = numLevels
+        # Number of ticks covered by a slot of each level
+        self.spans = [slotsPerLevel**level for level in range(0, numLevels + 1)]
+        self.levels = [[{} for slot in range(0, slotsPerLevel)] for level in range(0, numLevels)]
+        # Number of timers in each level
+        self.counts = [0] * numLevels
+        self.overflow = {}
+        # Heap of the (expiry, sequence number, key) of the timers expiring up to the current tick
+        self.ready = []
+        # Expiry time and sequence number of every timer armed, by key
+        self.timers = {}
+        # Bucket (level, slot) holding each timer that is in the wheel or overflow, by key
+        self.locations = {}
+        self.currentTick = 0
+        self.numArmed = 0
+
+# Getters
+
+    """
+    isArmed
+
+    @param key: key of the timer
+    @return: True if a timer is armed for the key
+    """
+    def isArmed(self, key):
+        return key in self.timers
+
+    """
+    getNumArmed
+
+    @return: number of timers armed
+    """
+    def getNumArmed(self):
+        return len(self.timers)
+
+# Functionality methods
+
+    """
+    arm
+
+    Arm (or re-arm) the timer of a key.
+
+    @param key: key of the timer
+    @param expiry: absolute time at which the timer fires
+    @return: none
+    """
+    def arm(self, key, expiry):
+        if key in self.timers:
+            self.cancel(key)
+        self.numArmed += 1
+        self.timers[key] = (expiry, self.numArmed)
+        self.place(key, expiry)
+
+    """
+    cancel
+
+    Cancel the timer of a key if it is armed. A timer already expiring within the current tick stays in the heap of
+    ready timers and is skipped when it comes up.
+
+    @param key: key of the timer
+    @return: none
+    """
+    def cancel(self, key):
+        if self.timers.pop(key, None) is None:
+            return
+        location = self.locations.pop(key, None)
+        if location is not None:
+            level, slot = location
+            if level is None:
+                del self.overflow[key]
+            else:
+                del self.levels[level][slot][key]
+                self.counts[level] -= 1
+
+    """
+    popNext
+
+    Turn the wheel up to limitTime at most and take out the earliest timer expiring by then.
+
+    @param limitTime: latest expiry time to fire a timer for -> may be infinite
+    @return: tuple of the key and expiry time of the timer, None if no timer expires by limitTime
+    """
+    def popNext(self, limitTime):
+        # The wheel can't be turned to an infinite tick
+        limitTick = int(min(limitTime, maxint) / self.resolution)
+        while True:
+            ready = self.ready
+            while ready:
+                expiry, sequence, key = ready[0]
+                if self.timers.get(key) != (expiry, sequence):
+                    # Cancelled or re-armed
+                    heappop(ready)
+                elif expiry <= limitTime:
+                    heappop(ready)
+                    del self.timers[key]
+                    return key, expiry
+                else:
+                    # Every timer still in the wheel expires in a later tick
+                    return None
+            if self.currentTick >= limitTick:
+                return None
+            self.advance(limitTick)
+
+    """
+    clear
+
+    Cancel every timer and turn the wheel back to tick 0.
+
+    @return: none
+    """
+    def clear(self):
+        for slots in self.levels:
+            for slot in slots:
+                slot.clear()
+        self.counts = [0] * self.numLevels
+        self.overflow.clear()
+        self.ready = []
+        self.timers.clear()
+        self.locations.clear()
+        self.currentTick = 0
+
+# Update methods
+
+    """
+    place
+
+    Put a timer in the bucket matching how far its expiry is from the current tick.
+
+    @param key: key of the timer
+    @param expiry: absolute time at which the timer fires
+    @return: none
+    """
+    def place(self, key, expiry):
+        tick = int(expiry / self.resolution)
+        delta = tick - self.currentTick
+        if delta <= 0:
+            heappush(self.ready, (expiry, self.timers[key][1], key))
+            return
+        for level in range(0, self.numLevels):
+            if delta < self.spans[level + 1]:
+                slot = (tick // self.spans[level]) % self.slotsPerLevel
+                self.levels[level][slot][key] = expiry
+                self.counts[level] += 1
+                self.locations[key] = (level, slot)
+                return
+        self.overflow[key] = expiry
+        self.locations[key] = (None, None)
+
+    """
+    advance
+
+    Turn the wheel to the next tick at which something can happen, up to limitTick. The slots of the higher levels
+    whose turn has come are cascaded down, then the timers of the level 0 slot of the tick are made ready.
+
+    @param limitTick: tick not to turn the wheel past
+    @return: none
+    """
+    def advance(self, limitTick):
+        # The next tick that can hold timers is the next boundary of the lowest level that isn't empty
+        nextTick = limitTick
+        for level in range(0, self.numLevels):
+            if self.counts[level] > 0:
+                span = self.spans[level]
+                nextTick = min(limitTick, (self.currentTick // span + 1) * span)
+                break
+        else:
+            if self.overflow:
+                span = self.spans[self.numLevels - 1]
+                nextTick = min(limitTick, (self.currentTick // span + 1) * span)
+        self.currentTick = nextTick
+        # Cascade the slots of every level whose boundary is reached, from the top down
+        if nextTick % self.spans[self.numLevels - 1] == 0 and self.overflow:
+            self.cascade(self.overflow)
+        for level in range(self.numLevels - 1, 0, -1):
+            if nextTick % self.spans[level] == 0:
+                slots = self.levels[level]
+                slot = (nextTick // self.spans[level]) % self.slotsPerLevel
+                if slots[slot]:
+                    self.counts[level] -= len(slots[slot])
+                    bucket = slots[slot]
+                    slots[slot] = {}
+                    self.cascade(bucket)
+        slots = self.levels[0]
+        slot = nextTick % self.slotsPerLevel
+        if slots[slot]:
+            self.counts[0] -= len(slots[slot])
+            bucket = slots[slot]
+            slots[slot] = {}
+            for key, expiry in bucket.iteritems():
+                del self.locations[key]
+                heappush(self.ready, (expiry, self.timers[key][1], key))
+
+    """
+    cascade
+
+    Place the timers of a bucket again now that the wheel has turned closer to their expiry.
+
+    @param bucket: dictionary of the expiry times of the timers by key, emptied by the method
+    @return: none
+    """
+    def cascade(self, bucket):
+        timers = bucket.items()
+        bucket.clear()
+        for key, expiry in timers:
+            del self.locations[key]
+            self.place(key, expiry)
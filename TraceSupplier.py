@@ -0,0 +1,231 @@
+import csv
+import numpy as np
+
+class TraceSupplier(object):
+
+    # Rows of the columnar trace file
+    _ARRIVAL_TIME = 0
+    _PROCESSING_TIME = 1
+    _MIPS = 2
+
+    """
+    __init__
+
+    Initialize a supplier that replays a job trace in place of the random variates of a VariateSupplier.
+    The trace is a .npy file holding a (3, numJobs) array whose rows are the arrival times, processing times and MIPS of
+    the jobs, sorted by arrival time (see convertTraceFromCSV). It is memory-mapped and read chunkSize jobs at a time,
+    so the trace never has to fit in memory. Every repetition replays the trace from the start; only the random server
+    choices are drawn, from a NumPy generator seeded from (seed, repetition).
+    Once the trace runs out no more jobs arrive.
+
+    @param tracePath: path of the .npy trace file
+    @param numServers: number of servers that the simulator contains
+    @param seed: non-negative integer seed for the random server choices
+    @param repetition: index of the repetition the jobs are for
+    @param chunkSize: number of jobs read from the trace at once
+    @return: none
+    """
+    def __init__(self, tracePath, numServers, seed, repetition=0, chunkSize=65536):
+        super(TraceSupplier, self).__init__()
+        self.tracePath = tracePath
+        self.trace = np.load(tracePath, mmap_mode='r')
+        self.numServers = numServers
+        self.chunkSize = chunkSize
+        self.generator = np.random.RandomState([seed, repetition])
+        # Index of the first job of the current chunk and position of the next job within it
+        self.chunkStart = 0
+        self.position = 0
+        self.arrivalTimes = []
+        self.processingTimes = []
+        self.jobMIPS = []
+        self.lastArrivalTime = 0.0
+        self.servers = []
+        self.serverPosition = 0
+        # State of the generator before the current block of server choices was drawn
+        self.serverState = None
+
+# Getters
+
+    """
+    nextArrival
+
+    Move on to the next job of the trace, reading the next chunk if the current one has been used up.
+
+    @return: time from the previous arrival until the arrival of the next job, infinity once the trace runs out
+    """
+    def nextArrival(self):
+        if self.position == len(self.arrivalTimes):
+            self.readChunk()
+            if len(self.arrivalTimes) == 0:
+                return float('inf')
+        arrivalTime = self.arrivalTimes[self.position]
+        interarrivalTime = arrivalTime - self.lastArrivalTime
+        self.lastArrivalTime = arrivalTime
+        self.position += 1
+        return interarrivalTime
+
+    """
+    nextProcessingTime
+
+    @return: processing time of the job that arrived last
+    """
+    def nextProcessingTime(self):
+        return self.processingTimes[self.position - 1]
+
+    """
+    nextJobMIPS
+
+    @return: MIPS requirement of the job that arrived last
+    """
+    def nextJobMIPS(self):
+        return self.jobMIPS[self.position - 1]
+
+    """
+    nextRandomServer
+
+    @return: index of a random server, drawn the same way as (randint(0,100)) % numServers
+    """
+    def nextRandomServer(self):
+        if self.serverPosition == len(self.servers):
+            self.drawServers()
+            self.serverPosition = 0
+        self.serverPosition += 1
+        return self.servers[self.serverPosition - 1]
+
+# Functionality methods
+
+    """
+    __getstate__
+
+    Leave out the memory-mapped trace, the current chunk and the current block of server choices when the supplier is
+    pickled. The generator is kept in the state it had before drawing the block.
+
+    @return: dictionary of the state of the supplier
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['trace']
+        del state['arrivalTimes']
+        del state['processingTimes']
+        del state['jobMIPS']
+        del state['servers']
+        state['generator'] = self.serverState if self.servers else self.generator.get_state()
+        del state['serverState']
+        return state
+
+    """
+    __setstate__
+
+    Restore a pickled supplier, mapping the trace file again and reading the current chunk and drawing the current block
+    of server choices again. The positions within them are kept.
+
+    @param state: dictionary of the state of the supplier
+    @return: none
+    """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.trace = np.load(self.tracePath, mmap_mode='r')
+        generatorState = self.generator
+        self.generator = np.random.RandomState()
+        self.generator.set_state(generatorState)
+        self.servers = []
+        self.serverState = None
+        if self.serverPosition > 0:
+            self.drawServers()
+        self.arrivalTimes = []
+        position = self.position
+        self.readChunk()
+        self.position = position
+
+    """
+    readChunk
+
+    Read the next chunkSize jobs of the trace. The chunk is converted to lists so that handing out single values
+    gives plain Python numbers.
+
+    @return: none
+    """
+    def readChunk(self):
+        self.chunkStart += len(self.arrivalTimes)
+        chunkEnd = self.chunkStart + self.chunkSize
+        self.arrivalTimes = self.trace[TraceSupplier._ARRIVAL_TIME, self.chunkStart:chunkEnd].tolist()
+        self.processingTimes = self.trace[TraceSupplier._PROCESSING_TIME, self.chunkStart:chunkEnd].tolist()
+        self.jobMIPS = self.trace[TraceSupplier._MIPS, self.chunkStart:chunkEnd].tolist()
+        self.position = 0
+
+    """
+    drawServers
+
+    Draw the next block of random server choices.
+
+    @return: none
+    """
+    def drawServers(self):
+        self.serverState = self.generator.get_state()
+        self.servers = (self.generator.randint(0, 101, 4096) % self.numServers).tolist()
+
+"""
+convertTraceFromCSV
+
+Convert a CSV job trace with one (arrival time, processing time, MIPS) row per job, sorted by arrival time, into the
+columnar .npy trace file read by TraceSupplier. A header row is skipped if there is one, and so are jobs with a
+processing time that isn't positive since the servers would never queue them. The CSV is read twice, first to count the
+jobs and then to copy chunkSize jobs at a time into the memory-mapped trace file, so the memory used doesn't depend on
+the length of the trace.
+
+@param csvPath: path of the CSV trace
+@param tracePath: path of the .npy trace file to write
+@param chunkSize: number of jobs copied at once
+@return: number of jobs in the trace
+"""
+def convertTraceFromCSV(csvPath, tracePath, chunkSize=65536):
+    hasHeader = hasCSVHeader(csvPath)
+    with open(csvPath, 'rb') as csvFile:
+        rows = csv.reader(csvFile)
+        if hasHeader:
+            next(rows)
+        numJobs = sum(1 for row in rows if isValidJob(row))
+    trace = np.lib.format.open_memmap(tracePath, mode='w+', dtype=np.float64, shape=(3, numJobs))
+    with open(csvPath, 'rb') as csvFile:
+        rows = csv.reader(csvFile)
+        if hasHeader:
+            next(rows)
+        numCopied = 0
+        chunk = []
+        for row in rows:
+            if isValidJob(row):
+                chunk.append(row[:3])
+            if len(chunk) == chunkSize:
+                trace[:, numCopied:numCopied + len(chunk)] = np.array(chunk, dtype=np.float64).T
+                numCopied += len(chunk)
+                chunk = []
+        if chunk:
+            trace[:, numCopied:numCopied + len(chunk)] = np.array(chunk, dtype=np.float64).T
+    trace.flush()
+    return numJobs
+
+"""
+isValidJob
+
+@param row: row of a CSV trace
+@return: True if the row is a job with a positive processing time
+"""
+def isValidJob(row):
+    return bool(row) and float(row[TraceSupplier._PROCESSING_TIME]) > 0
+
+"""
+hasCSVHeader
+
+@param csvPath: path of the CSV trace
+@return: True if the first row of the CSV isn't numeric, i.e. a header row
+"""
+def hasCSVHeader(csvPath):
+    with open(csvPath, 'rb') as csvFile:
+        for row in csv.reader(csvFile):
+            if row:
+                try:
+                    float(row[0])
+                    return False
+                except ValueError:
+                    return True
+    return False
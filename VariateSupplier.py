@@ -0,0 +1,163 @@
+import numpy as np
+
+class VariateSupplier(object):
+
+    # Stream identifiers -> each purpose draws from its own independently seeded generator
+    _ARRIVAL_STREAM = 0
+    _PROCESSING_STREAM = 1
+    _MIPS_STREAM = 2
+    _SERVER_STREAM = 3
+
+    """
+    __init__
+
+    Initialize the random variate supplier for one repetition of the simulation. Interarrival times, processing times,
+    job MIPS and random server choices are each drawn from their own NumPy generator seeded from (seed, repetition,
+    stream), so a repetition is exactly reproducible from its seed and the streams don't affect one another.
+    Variates are drawn blockSize at a time and handed out one by one; a new block is drawn when one runs out.
+    When pickled only the state each generator had before drawing its current block is kept, and the block is drawn
+    again on unpickling, so a checkpoint doesn't carry the blocks.
+
+    @param lamb: the interarrival rate for the simulator
+    @param mu: the job size parameter for the simulator
+    @param numServers: number of servers that the simulator contains
+    @param maxMIPS: the maximum number of millions of instructions per second (MIPS) that a job can reach
+    @param seed: non-negative integer seed for the simulation
+    @param repetition: index of the repetition the variates are for
+    @param blockSize: number of variates drawn at once for each stream
+    @return: none
+    """
+    def __init__(self, lamb, mu, numServers, maxMIPS, seed, repetition=0, blockSize=4096):
+        super(VariateSupplier, self).__init__()
+        self.lamb = lamb
+        self.mu = mu
+        self.numServers = numServers
+        self.maxMIPS = maxMIPS
+        self.blockSize = blockSize
+        self.generators = [np.random.RandomState([seed, repetition, stream]) for stream in range(0, 4)]
+        # Current block and position within it for each stream
+        self.blocks = [[], [], [], []]
+        self.positions = [0, 0, 0, 0]
+        # State of the generator of each stream before its current block was drawn
+        self.blockStates = [None, None, None, None]
+
+# Getters
+
+    """
+    nextArrival
+
+    @return: time until the next arrival, exponential with rate lambda
+    """
+    def nextArrival(self):
+        return self.nextVariate(VariateSupplier._ARRIVAL_STREAM)
+
+    """
+    nextProcessingTime
+
+    @return: processing time of a job, exponential with rate mu
+    """
+    def nextProcessingTime(self):
+        return self.nextVariate(VariateSupplier._PROCESSING_STREAM)
+
+    """
+    nextJobMIPS
+
+    Generate a random MIPS requirement for a job. MIPS is generated from the desired utilization,
+    but is allowed to "wiggle" within an acceptable margin; i.e. if the desired utilization is 0.7 then the MIPS can vary
+    between 0.7-0.7*wiggle to 0.7+0.7*wiggle utilization. The wiggle can be adjusted to lessen or increase the range.
+    The MIPS is clipped to between 0 and maxMIPS so jobs can't drive servers past 100% or below 0% utilization.
+
+    @return: the MIPS requirement for a job
+    """
+    def nextJobMIPS(self):
+        return self.nextVariate(VariateSupplier._MIPS_STREAM)
+
+    """
+    nextRandomServer
+
+    @return: index of a random server, drawn the same way as (randint(0,100)) % numServers
+    """
+    def nextRandomServer(self):
+        return self.nextVariate(VariateSupplier._SERVER_STREAM)
+
+# Functionality methods
+
+    """
+    nextVariate
+
+    Hand out the next variate of a stream, drawing a new block first if the current one has been used up.
+
+    @param stream: identifier of the stream
+    @return: the next variate of the stream
+    """
+    def nextVariate(self, stream):
+        position = self.positions[stream]
+        if position == len(self.blocks[stream]):
+            self.blocks[stream] = self.drawBlock(stream)
+            position = 0
+        self.positions[stream] = position + 1
+        return self.blocks[stream][position]
+
+    """
+    drawBlock
+
+    Draw blockSize variates for a stream. The block is returned as a list so that handing out single variates
+    gives plain Python numbers.
+
+    @param stream: identifier of the stream
+    @return: list of blockSize variates
+    """
+    def drawBlock(self, stream):
+        generator = self.generators[stream]
+        self.blockStates[stream] = generator.get_state()
+        if stream == VariateSupplier._ARRIVAL_STREAM:
+            return generator.exponential(1.0 / self.lamb, self.blockSize).tolist()
+        if stream == VariateSupplier._PROCESSING_STREAM:
+            return generator.exponential(1.0 / self.mu, self.blockSize).tolist()
+        if stream == VariateSupplier._MIPS_STREAM:
+            # Setpoint is generated from Utilization = (Lambda / (Mu*numServers))
+            setpoint = self.maxMIPS * (self.lamb / float(self.numServers))
+            wiggle = 0.40
+            lower = setpoint - wiggle * setpoint
+            upper = setpoint + wiggle * setpoint
+            mips = generator.uniform(lower, upper, self.blockSize)
+            return np.clip(mips, 0.0, self.maxMIPS).tolist()
+        return (generator.randint(0, 101, self.blockSize) % self.numServers).tolist()
+
+    """
+    __getstate__
+
+    Replace the generators and blocks by the state of each generator before its current block was drawn when the
+    supplier is pickled. A stream that hasn't drawn a block yet keeps the current state of its generator.
+
+    @return: dictionary of the state of the supplier
+    """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['generators'] = [self.blockStates[stream] if self.positions[stream] > 0 else generator.get_state()
+                               for stream, generator in enumerate(self.generators)]
+        del state['blocks']
+        del state['blockStates']
+        return state
+
+    """
+    __setstate__
+
+    Restore a pickled supplier, drawing the current block of each stream again from the state its generator had
+    before drawing it. The position within each block is kept, so the supplier carries on with the same variates.
+
+    @param state: dictionary of the state of the supplier
+    @return: none
+    """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        generatorStates = self.generators
+        self.generators = []
+        self.blocks = [[], [], [], []]
+        self.blockStates = [None, None, None, None]
+        for stream, generatorState in enumerate(generatorStates):
+            generator = np.random.RandomState()
+            generator.set_state(generatorState)
+            self.generators.append(generator)
+            if self.positions[stream] > 0:
+                self.blocks[stream] = self.drawBlock(stream)
@@ -0,0 +1,140 @@
+from Simulator import Simulator
+from multiprocessing import Pool
+from resource import getrusage, RUSAGE_SELF
+from time import time
+import argparse
+import json
+import platform
+import sys
+
+############################<<PARAMS>>############################
+mu                = 1
+numReps           = 1
+maxMIPS           = 2500000
+aggressivness     = 0.10
+seed              = 1
+# Number of events (arrivals + departures) each point is sized to run for
+targetEvents      = 200000
+fleetSizes        = [10, 100, 1000, 10000, 100000]
+utilizations      = [0.3, 0.5, 0.7, 0.9, 0.95]
+# Relative change in a measurement that counts as a regression
+tolerance         = 0.10
+##################################################################
+
+"""
+runPoint
+
+Run the simulator at one point of the sweep and measure it. Every point runs in its own process, and its peak RSS is
+measured as the growth of the process' maximum RSS over the point, since a forked process starts from the RSS it
+inherited. The simulated time is chosen so that about targetEvents events happen per repetition.
+
+@param args: tuple of the number of servers, utilization and number of events to size the run for
+@return: dictionary of the point and its measurements
+"""
+def runPoint(args):
+    numServers, util, numEvents = args
+    lamb = util * mu * numServers
+    # Each job is an arrival and a departure
+    simTime = numEvents / (2.0 * lamb)
+    baseRSS = getrusage(RUSAGE_SELF).ru_maxrss
+    mySim = Simulator(lamb, mu, numServers, simTime, numReps, maxMIPS, max(1, int(numServers * aggressivness)), seed=seed)
+    events = 0
+    startTime = time()
+    for simNumber in range(0, numReps):
+        mySim.runRepetition(simNumber)
+        events += mySim.numArrivals + mySim.numDepartures
+    wallTime = time() - startTime
+    return {'numServers': numServers,
+            'utilization': util,
+            'simTime': simTime,
+            'events': events,
+            'eventsPerSec': events / wallTime,
+            'wallTimePerRep': wallTime / numReps,
+            # Kilobytes on Linux, above the RSS the process had before the point
+            'peakRSS': getrusage(RUSAGE_SELF).ru_maxrss - baseRSS}
+
+"""
+runBenchmarks
+
+Sweep the simulator over every combination of fleet size and utilization and write the measurements to a JSON file.
+
+@param outputPath: path of the JSON file to write
+@param servers: list of fleet sizes to sweep
+@param utils: list of utilizations to sweep
+@param numEvents: number of events each point is sized to run for
+@return: list of the measurements of every point
+"""
+def runBenchmarks(outputPath, servers, utils, numEvents):
+    points = []
+    print 'servers\t  util\t  events/s\t  s/rep\t  peak RSS (KB)'
+    for numServers in servers:
+        for util in utils:
+            pool = Pool(1)
+            try:
+                point = pool.apply(runPoint, ((numServers, util, numEvents),))
+            finally:
+                pool.close()
+                pool.join()
+            print '%7d\t%6.2f\t%10.0f\t%7.3f\t%15d' % (numServers, util, point['eventsPerSec'], point['wallTimePerRep'], point['peakRSS'])
+            points.append(point)
+    with open(outputPath, 'w') as outputFile:
+        json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'numReps': numReps,
+                   'seed': seed, 'points': points}, outputFile, indent=2)
+    return points
+
+"""
+compareBenchmarks
+
+Compare the measurements of a run against a stored baseline. A point regresses if its events/sec dropped, or its wall
+time per rep or peak RSS grew, by more than the tolerance relative to the baseline. Points missing from either file are
+skipped.
+
+@param baselinePath: path of the JSON file of the baseline
+@param resultsPath: path of the JSON file of the run to check
+@param tol: relative change that counts as a regression
+@return: list of descriptions of the regressions found
+"""
+def compareBenchmarks(baselinePath, resultsPath, tol):
+    with open(baselinePath) as baselineFile:
+        baseline = json.load(baselineFile)
+    with open(resultsPath) as resultsFile:
+        results = json.load(resultsFile)
+    baselinePoints = dict(((p['numServers'], p['utilization']), p) for p in baseline['points'])
+    regressions = []
+    print 'servers\t  util\t  events/s\t  s/rep\t  peak RSS'
+    for point in results['points']:
+        key = (point['numServers'], point['utilization'])
+        if key not in baselinePoints:
+            continue
+        base = baselinePoints[key]
+        changes = (point['eventsPerSec'] / base['eventsPerSec'] - 1,
+                   point['wallTimePerRep'] / base['wallTimePerRep'] - 1,
+                   float(point['peakRSS']) / base['peakRSS'] - 1 if base['peakRSS'] > 0 else 0.0)
+        print '%7d\t%6.2f\t%+9.1f%%\t%+6.1f%%\t%+9.1f%%' % (key[0], key[1], changes[0]*100, changes[1]*100, changes[2]*100)
+        if changes[0] < -tol:
+            regressions.append('%d servers at %.2f: events/sec dropped %.1f%%' % (key[0], key[1], -changes[0]*100))
+        if changes[1] > tol:
+            regressions.append('%d servers at %.2f: wall time per rep grew %.1f%%' % (key[0], key[1], changes[1]*100))
+        if changes[2] > tol:
+            regressions.append('%d servers at %.2f: peak RSS grew %.1f%%' % (key[0], key[1], changes[2]*100))
+    for regression in regressions:
+        print 'REGRESSION:', regression
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulator throughput benchmarks')
+    commands = parser.add_subparsers(dest='command')
+    runParser = commands.add_parser('run', help='sweep fleet sizes and utilizations and write the measurements')
+    runParser.add_argument('output', help='path of the JSON file to write')
+    runParser.add_argument('--servers', type=int, nargs='+', default=fleetSizes)
+    runParser.add_argument('--utils', type=float, nargs='+', default=utilizations)
+    runParser.add_argument('--events', type=int, default=targetEvents)
+    compareParser = commands.add_parser('compare', help='flag regressions against a stored baseline')
+    compareParser.add_argument('baseline', help='path of the JSON file of the baseline')
+    compareParser.add_argument('results', help='path of the JSON file of the run to check')
+    compareParser.add_argument('--tolerance', type=float, default=tolerance)
+    args = parser.parse_args()
+    if args.command == 'run':
+        runBenchmarks(args.output, args.servers, args.utils, args.events)
+    elif compareBenchmarks(args.baseline, args.results, args.tolerance):
+        sys.exit(1)
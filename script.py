@@ -1,4 +1,5 @@
 from Simulator import Simulator
+from ResultCache import ResultCache
 import numpy as np
 import scipy as sp
 import scipy.stats
@@ -22,20 +23,28 @@ st   = 100
 reps = 1
 maxMIPS = 2500000
 aggressivness = 0.10
+# Relative CI half-width to keep adding reps until -> None to run exactly reps reps
+precision = None
+maxReps = 100
+# Seed and path of the SQLite file results are kept in across runs -> a run is only cached if the seed is set
+seed = None
+cachePath = None
+resultCache = ResultCache(cachePath) if cachePath is not None else None
+if resultCache is not None and seed is None:
+    # A fresh seed per run would never hit the results cached by earlier runs
+    seed = 1
+    print 'seed is not set, using', seed, '-> the cache only hits across runs with the same seed'
 
 util = lamb / (float)(mu * c)
 
 # 	def __init__(lamb, mu, c, simTime, reps):
-mySim = Simulator(lamb, mu, c, st, reps, maxMIPS, c*aggressivness)
+mySim = Simulator(lamb, mu, c, st, reps, maxMIPS, c*aggressivness, relativePrecision=precision, maxReps=maxReps,
+                  seed=seed, resultCache=resultCache)
 
 mySim.runSimulation()
 
 throughput = mySim.getThroughput()
 avgjobsinsys = mySim.getAvgJobsInSimulation()
-powerConsumedByServers = mySim.getPowerConsumptions()
-avgUtilizations = mySim.getAvgServerUtils()
-maxTemps = mySim.getMaxTemps()
-rrs = mySim.getAvgResponseTime()
 
 roundedAvg = [round(elem, accuracy) for elem in avgjobsinsys]
 roundedThroughput = [round(elem, accuracy) for elem in throughput]
@@ -45,6 +54,8 @@ print 'Params: (', lamb, ', ', mu, ', ', c, ', ', st, ', ', reps , ', ', maxMIPS
 
 print 'Utilization: ', round(util, accuracy)
 
+print 'Repetitions: ', mySim.getNumRepetitionsRun()
+
 print 'Throughput: ', roundedThroughput
 
 print 'Avg # Jobs in System: ', roundedAvg
@@ -53,24 +64,27 @@ print 'Throughput Average: ', round((sum(roundedThroughput) / len(roundedThrough
 
 print 'Average Average Number of Jobs in System: ', round((sum(roundedAvg) / len(roundedAvg)), accuracy)
 
-for rep in powerConsumedByServers:
-    index = powerConsumedByServers.index(rep)
+# Index the repetitions by position in the result arrays -> reps with identical results are still told apart
+results = mySim.getResults()
+for index in range(0, results.getNumReps()):
     print '*****************************************************'
     print 'Log dump for rep', index+1
-    print 'Avg avg utils: ', sum(avgUtilizations[index]) / len(avgUtilizations[index])
-    print 'Avg power consumed', sum(powerConsumedByServers[index]) / len(powerConsumedByServers[index])
-    print 'Avg Response Time', sum(rrs[index]) / len(rrs[index])
-    for i in range(0, len(rep)):
-        print 'Server', i, '\tUtil:', avgUtilizations[index][i], '\tMax temp:', maxTemps[index][i],  '\t\tConsumed:', powerConsumedByServers[index][i], '\tRT:', rrs[index][i]
+    print 'Avg avg utils: ', results.utilization[index].mean()
+    print 'Avg power consumed', results.energy[index].mean()
+    print 'Avg Response Time', results.responseTime[index].mean()
+    for i in range(0, results.getNumServers()):
+        print 'Server', i, '\tUtil:', results.utilization[index][i], '\tMax temp:', results.maxTemp[index][i],  '\t\tConsumed:', results.energy[index][i], '\tRT:', results.responseTime[index][i]
 
 # mean, lower, upper = mean_confidence_interval(avgjobsinsys)
 
 # print 'CI: [', round(lower, accuracy), ',', round(upper, accuracy), ']'
 
-# mySim = Simulator(lamb, mu, 2, st, 1)
+# from TimeSeriesRecorder import TimeSeriesRecorder
+# recorder = TimeSeriesRecorder(timeStride=0.1)
+# mySim = Simulator(lamb, mu, 2, st, 1, maxMIPS, 1, recorder=recorder)
 # mySim.runSimulation()
-# xAxis = mySim.getXAxis()
-# yAxis = mySim.getYAxis()
+# xAxis = recorder.getXAxis()
+# yAxis = recorder.getYAxis()
 #
 # plt.plot(xAxis, yAxis)
 # plt.title('RR - 95% Utilization 2 Servers')
@@ -0,0 +1,142 @@
+from Simulator import Simulator
+from multiprocessing import Pool
+import argparse
+import hashlib
+import itertools
+import json
+import os
+
+############################<<PARAMS>>############################
+# Defaults for the Simulator arguments a spec leaves out
+defaults = {'lamb': 13.75, 'mu': 1, 'numServers': 25, 'simTime': 100, 'numReps': 5, 'jobMaxMIPS': 2500000,
+            'toTurnOn': 1, 'seed': 1}
+numWorkers        = 4
+chunkSize         = 4
+# Per repetition metrics written for every job (see Simulator.getRepetitionMetric)
+metrics           = ('throughput', 'avgJobsInSystem', 'power', 'utilization', 'maxTemp', 'responseTime')
+##################################################################
+
+"""
+expandSpec
+
+Expand a sweep spec into the list of Simulator jobs it describes. The spec is a dictionary with:
+
+-> grid: dictionary of Simulator argument names to lists of values, every combination of which is a job
+-> points: list of dictionaries of Simulator arguments, each of which is a job
+-> fixed: dictionary of Simulator arguments shared by every job
+
+Arguments left out take the values in defaults. An 'aggressivness' argument is the fraction of the servers turned on
+initially, i.e. toTurnOn = max(1, int(numServers * aggressivness)), as in benchmark.py.
+
+@param spec: the sweep spec
+@return: list of dictionaries of the Simulator keyword arguments of each job
+"""
+def expandSpec(spec):
+    points = list(spec.get('points', []))
+    grid = spec.get('grid', {})
+    if grid:
+        names = sorted(grid.keys())
+        for values in itertools.product(*[grid[name] for name in names]):
+            points.append(dict(zip(names, values)))
+    jobs = []
+    for point in points:
+        job = dict(defaults)
+        job.update(spec.get('fixed', {}))
+        job.update(point)
+        if 'aggressivness' in job:
+            job['toTurnOn'] = max(1, int(job['numServers'] * job.pop('aggressivness')))
+        jobs.append(job)
+    return jobs
+
+"""
+getJobID
+
+@param job: dictionary of the Simulator keyword arguments of a job
+@return: identifier of the job, the same whatever the order of the spec it came from
+"""
+def getJobID(job):
+    return hashlib.sha1(json.dumps(job, sort_keys=True).encode('utf-8')).hexdigest()
+
+"""
+runSweepJob
+
+Run the simulation of a job, within a worker process.
+
+@param job: dictionary of the Simulator keyword arguments of the job
+@return: dictionary of the job's identifier, arguments and per repetition metrics
+"""
+def runSweepJob(job):
+    mySim = Simulator(**job)
+    mySim.runSimulation()
+    record = {'id': getJobID(job), 'parameters': job, 'numReps': mySim.getNumRepetitionsRun()}
+    for metric in metrics:
+        record[metric] = mySim.getRepetitionMetric(metric)
+    return record
+
+"""
+getFinishedJobs
+
+Read the identifiers of the jobs already in an output file. A line cut short by an interruption is ignored and its job
+is run again.
+
+@param outputPath: path of the JSON lines output file
+@return: set of the identifiers of the finished jobs
+"""
+def getFinishedJobs(outputPath):
+    finished = set()
+    if os.path.exists(outputPath):
+        with open(outputPath) as outputFile:
+            for line in outputFile:
+                try:
+                    finished.add(json.loads(line)['id'])
+                except ValueError:
+                    pass
+    return finished
+
+"""
+runSweep
+
+Run every job of a sweep spec that isn't in the output file yet on a pool of worker processes, handing the jobs out
+chunkSize at a time. Each result is appended to the output file as one JSON line and flushed to disk as soon as it comes
+back, so an interrupted sweep resumes where it stopped when it is run again with the same output file.
+
+@param spec: the sweep spec (see expandSpec)
+@param outputPath: path of the JSON lines output file
+@param workers: number of worker processes
+@param chunk: number of jobs handed to a worker at a time
+@return: number of jobs run
+"""
+def runSweep(spec, outputPath, workers, chunk):
+    finished = getFinishedJobs(outputPath)
+    jobs = [job for job in expandSpec(spec) if getJobID(job) not in finished]
+    print len(finished), 'jobs already finished,', len(jobs), 'to run'
+    if not jobs:
+        return 0
+    # Drop a line cut short by an interruption so the next record starts on its own line
+    if os.path.exists(outputPath):
+        with open(outputPath, 'rb+') as outputFile:
+            content = outputFile.read()
+            if content and not content.endswith('\n'):
+                outputFile.truncate(content.rfind('\n') + 1)
+    pool = Pool(workers)
+    try:
+        with open(outputPath, 'a') as outputFile:
+            for numDone, record in enumerate(pool.imap_unordered(runSweepJob, jobs, chunk), 1):
+                outputFile.write(json.dumps(record) + '\n')
+                outputFile.flush()
+                os.fsync(outputFile.fileno())
+                print numDone, '/', len(jobs), record['parameters']
+    finally:
+        pool.close()
+        pool.join()
+    return len(jobs)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Resumable parameter sweeps of the simulator')
+    parser.add_argument('spec', help='path of the JSON sweep spec')
+    parser.add_argument('output', help='path of the JSON lines file results are appended to')
+    parser.add_argument('--workers', type=int, default=numWorkers)
+    parser.add_argument('--chunk', type=int, default=chunkSize)
+    args = parser.parse_args()
+    with open(args.spec) as specFile:
+        runSweep(json.load(specFile), args.output, args.workers, args.chunk)
@@ -0,0 +1,125 @@
+from TimerWheel import TimerWheel
+from random import Random
+import unittest
+
+class TimerWheelTest(unittest.TestCase):
+
+    """
+    setUp
+
+    A small wheel of 3 levels of 4 slots covers only 64 ticks, so short runs already cascade through every level and
+    spill into the overflow bucket.
+
+    @return: none
+    """
+    def setUp(self):
+        self.wheel = TimerWheel(resolution=0.01, slotsPerLevel=4, numLevels=3)
+
+    def testFiresInOrderOfExpiry(self):
+        for key, expiry in enumerate([0.35, 0.05, 0.2, 0.1]):
+            self.wheel.arm(key, expiry)
+        fired = [self.wheel.popNext(1.0) for i in range(0, 4)]
+        self.assertEqual(fired, [(1, 0.05), (3, 0.1), (2, 0.2), (0, 0.35)])
+        self.assertIsNone(self.wheel.popNext(1.0))
+
+    def testTiesFireInOrderOfArming(self):
+        for key in [2, 0, 1]:
+            self.wheel.arm(key, 0.5)
+        self.assertEqual([self.wheel.popNext(1.0)[0] for i in range(0, 3)], [2, 0, 1])
+
+    def testCascadesFromTheHigherLevels(self):
+        # 30 ticks away is in level 2, 5 ticks away in level 1
+        self.wheel.arm('far', 0.305)
+        self.wheel.arm('near', 0.055)
+        self.assertEqual(self.wheel.counts, [0, 1, 1])
+        self.assertEqual(self.wheel.popNext(1.0), ('near', 0.055))
+        self.assertEqual(self.wheel.popNext(1.0), ('far', 0.305))
+        self.assertEqual(self.wheel.counts, [0, 0, 0])
+
+    def testOverflowBucket(self):
+        # Beyond the 64 ticks covered by the wheel
+        self.wheel.arm(0, 2.5)
+        self.wheel.arm(1, 0.9)
+        self.assertIn(0, self.wheel.overflow)
+        self.assertEqual(self.wheel.popNext(10.0), (1, 0.9))
+        self.assertEqual(self.wheel.popNext(10.0), (0, 2.5))
+        self.assertFalse(self.wheel.overflow)
+
+    def testPopNextStopsAtTheLimit(self):
+        self.wheel.arm(0, 0.5)
+        self.wheel.arm(1, 0.505)
+        self.assertIsNone(self.wheel.popNext(0.49))
+        # Same tick as the limit but later than it
+        self.assertEqual(self.wheel.popNext(0.502), (0, 0.5))
+        self.assertIsNone(self.wheel.popNext(0.502))
+        self.assertEqual(self.wheel.popNext(float('inf')), (1, 0.505))
+
+    def testCancelAndRearm(self):
+        self.wheel.arm(0, 0.3)
+        self.wheel.arm(1, 1.5)
+        self.wheel.arm(2, 0.4)
+        self.wheel.cancel(1)
+        self.wheel.arm(0, 0.6)
+        self.wheel.cancel(5)
+        self.assertEqual(self.wheel.getNumArmed(), 2)
+        self.assertEqual(self.wheel.popNext(2.0), (2, 0.4))
+        self.assertEqual(self.wheel.popNext(2.0), (0, 0.6))
+        self.assertIsNone(self.wheel.popNext(2.0))
+
+    """
+    testMatchesAHeap
+
+    Drive wheels of several shapes with random arms, cancels and pops, checking every timer fired against a plain
+    sorted reference of the armed timers.
+    """
+    def testMatchesAHeap(self):
+        for seed in range(0, 20):
+            random = Random(seed)
+            slotsPerLevel, numLevels = random.choice([(2, 2), (4, 3), (8, 2), (64, 4)])
+            wheel = TimerWheel(random.choice([0.01, 0.1, 1.0]), slotsPerLevel, numLevels)
+            self.checkAgainstReference(wheel, random)
+
+    """
+    checkAgainstReference
+
+    @param wheel: the TimerWheel to check
+    @param random: generator of the operations
+    @return: none
+    """
+    def checkAgainstReference(self, wheel, random):
+        # Expiry and arming order of every armed timer, by key
+        armed = {}
+        numArmed = 0
+        currentTime = 0.0
+        for step in range(0, 2000):
+            operation = random.random()
+            key = random.randint(0, 30)
+            if operation < 0.5:
+                # Short, long and far beyond the wheel, with ties from a coarse grid
+                delay = random.choice([random.uniform(0, 0.5), random.uniform(0, 50), random.uniform(0, 5000),
+                                       round(random.uniform(0, 5), 1)])
+                numArmed += 1
+                armed[key] = (currentTime + delay, numArmed)
+                wheel.arm(key, currentTime + delay)
+            elif operation < 0.6:
+                armed.pop(key, None)
+                wheel.cancel(key)
+            else:
+                limitTime = currentTime + random.choice([0, random.uniform(0, 1), random.uniform(0, 100)])
+                due = sorted((expiry, order, key) for key, (expiry, order) in armed.items() if expiry <= limitTime)
+                fired = wheel.popNext(limitTime)
+                if due:
+                    expiry, order, key = due[0]
+                    self.assertEqual(fired, (key, expiry))
+                    del armed[key]
+                    currentTime = expiry
+                else:
+                    self.assertIsNone(fired)
+                    currentTime = limitTime
+            self.assertEqual(wheel.getNumArmed(), len(armed))
+        for expiry, order, key in sorted((expiry, order, key) for key, (expiry, order) in armed.items()):
+            self.assertEqual(wheel.popNext(float('inf')), (key, expiry))
+        self.assertIsNone(wheel.popNext(float('inf')))
+
+if __name__ == '__main__':
+    unittest.main()